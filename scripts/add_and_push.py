@@ -3,16 +3,19 @@
 Add and Push - Scrapes one workflow and pushes it to GitHub automatically.
 """
 
+import shlex
 import subprocess
-import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def run_command(command, description):
     """Run a command and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        # Exec the target binary directly rather than through /bin/sh
+        args = shlex.split(command) if isinstance(command, str) else command
+        result = subprocess.run(args, capture_output=True, text=True)
         if result.returncode == 0:
             print(f"✅ {description} completed")
             return True
@@ -23,24 +26,50 @@ def run_command(command, description):
         print(f"❌ {description} error: {e}")
         return False
 
+def get_changed_workflows():
+    """Return workflow files that git reports as new or modified."""
+    result = subprocess.run(
+        ["git", "status", "--porcelain", "-z", "--untracked-files=all", "workflows/"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"❌ git status failed: {result.stderr}")
+        return []
+    
+    changed = []
+    for record in result.stdout.split('\0'):
+        # Each record is "XY path"; renames add a second record with the old path
+        if len(record) < 4 or record[2] != ' ':
+            continue
+        status, path = record[:2], record[3:]
+        if path.endswith('.json') and ('?' in status or 'A' in status or 'M' in status):
+            changed.append(Path(path))
+    return changed
+
 def add_and_push_workflow(workflow_url=None):
     """Scrape one workflow and push to GitHub."""
     print("🚀 Add and Push Workflow")
     print("=" * 50)
     
-    # Step 1: Scrape the workflow
-    if workflow_url:
-        print(f"🔍 Scraping workflow: {workflow_url}")
-        success = run_command(
-            f"python3 scripts/single_scraper.py --url '{workflow_url}'",
-            "Scraping workflow"
-        )
-    else:
-        print("🔍 Starting interactive scraper...")
-        success = run_command(
-            "python3 scripts/single_scraper.py",
-            "Scraping workflow"
-        )
+    # Step 1: Scrape the workflow, fetching origin/main in the background meanwhile
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        fetch_future = executor.submit(run_command, ["git", "fetch", "origin", "main"], "Fetching origin/main")
+        
+        if workflow_url:
+            print(f"🔍 Scraping workflow: {workflow_url}")
+            success = run_command(
+                ["python3", "scripts/single_scraper.py", "--url", workflow_url],
+                "Scraping workflow"
+            )
+        else:
+            print("🔍 Starting interactive scraper...")
+            success = run_command(
+                ["python3", "scripts/single_scraper.py"],
+                "Scraping workflow"
+            )
+    
+    if not fetch_future.result():
+        print("⚠️  Could not fetch origin/main, push may be rejected")
     
     if not success:
         print("❌ Workflow scraping failed")
@@ -48,13 +77,7 @@ def add_and_push_workflow(workflow_url=None):
     
     # Step 2: Check if new files were added
     print("\n📊 Checking for new workflows...")
-    workflows_before = set(Path('workflows').glob('*.json'))
-    
-    # Wait a moment for file system
-    time.sleep(2)
-    
-    workflows_after = set(Path('workflows').glob('*.json'))
-    new_workflows = workflows_after - workflows_before
+    new_workflows = get_changed_workflows()
     
     if not new_workflows:
         print("⚠️  No new workflows were added")
@@ -64,22 +87,17 @@ def add_and_push_workflow(workflow_url=None):
     for workflow in new_workflows:
         print(f"  📄 {workflow.name}")
     
-    # Step 3: Add files to git
-    success = run_command("git add workflows/ indexes/", "Adding files to git")
-    if not success:
-        return False
-    
-    # Step 4: Commit
+    # Step 3: Add, commit and push, stopping at the first failure
     workflow_names = [w.stem for w in new_workflows]
     commit_message = f"📦 Add workflow(s): {', '.join(workflow_names)}"
-    success = run_command(f'git commit -m "{commit_message}"', "Committing changes")
-    if not success:
-        return False
-    
-    # Step 5: Push to GitHub
-    success = run_command("git push origin main", "Pushing to GitHub")
-    if not success:
-        return False
+    git_steps = [
+        (["git", "add", "workflows/", "indexes/"], "Adding files to git"),
+        (["git", "commit", "-m", commit_message], "Committing changes"),
+        (["git", "push", "origin", "main"], "Pushing to GitHub")
+    ]
+    for command, description in git_steps:
+        if not run_command(command, description):
+            return False
     
     print("\n🎉 SUCCESS!")
     print(f"✅ Added {len(new_workflows)} workflow(s) to GitHub")
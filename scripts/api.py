@@ -4,15 +4,36 @@ FastAPI server for n8n workflow library
 Provides REST API endpoints for searching and accessing workflows
 """
 
+import asyncio
 import json
+import mmap
 import os
+import threading
+from collections import OrderedDict, defaultdict
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException, Query
+from typing import List, Dict, Any, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel
+import numpy as np
 import uvicorn
 
+# Prefer orjson for parsing and response serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson lets /api/stats read index headers without parsing the whole file
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Import semantic search
 try:
     from semantic_search import SemanticSearch
@@ -24,7 +45,8 @@ except ImportError:
 app = FastAPI(
     title="n8n Workflow Library API",
     description="API for searching and accessing n8n workflows with semantic search capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Add CORS middleware
@@ -46,6 +68,23 @@ if SEMANTIC_AVAILABLE:
     except Exception as e:
         print(f"⚠️ Failed to load semantic search: {e}")
 
+# Parsed JSON files keyed by path, invalidated when the file's mtime changes
+_INDEX_CACHE: Dict[str, Tuple[int, Any]] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+# Recently served workflow files, mtime-checked like the index cache but capped in size
+# (every uvicorn worker holds its own copy, so caching the whole library is too costly)
+WORKFLOW_CACHE_SIZE = 256
+_WORKFLOW_CACHE: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+_WORKFLOW_CACHE_LOCK = threading.Lock()
+
+# Lowercase-keyed views of index sections, tied to the parsed index they came from
+_LOOKUP_CACHE: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+
+# In-memory search index over the workflows directory, rebuilt when the library changes
+_search_index: Optional[Dict[str, Any]] = None
+_SEARCH_INDEX_LOCK = threading.Lock()
+
 class WorkflowResponse(BaseModel):
     workflow_id: str
     name: str
@@ -75,7 +114,9 @@ async def root():
             "similar": "/api/similar/{workflow_id} - Find similar workflows",
             "workflow": "/api/workflow/{filename} - Get specific workflow",
             "categories": "/api/categories - List all categories",
+            "category": "/api/categories/{category} - Get workflows in a category",
             "integrations": "/api/integrations - List all integrations",
+            "integration": "/api/integrations/{integration} - Get workflows using an integration",
             "quality": "/api/quality - Get quality rankings",
             "manifest": "/api/manifest - Get complete catalog",
             "stats": "/api/stats - Get library statistics",
@@ -87,20 +128,21 @@ async def root():
 @app.get("/api/search")
 async def search_workflows(
     q: str = Query(..., description="Search query"),
-    limit: int = Query(10, description="Number of results to return"),
-    search_type: str = Query("semantic", description="Search type: semantic, keyword, or hybrid")
+    limit: int = Query(10, ge=1, description="Number of results to return"),
+    search_type: str = Query("semantic", description="Search type: semantic, keyword, or hybrid"),
+    category: Optional[str] = Query(None, description="Only return workflows in this category"),
+    integration: Optional[str] = Query(None, description="Only return workflows using this integration"),
+    complexity: Optional[str] = Query(None, description="Only return workflows with this complexity"),
+    min_quality: Optional[int] = Query(None, description="Minimum quality score"),
+    max_nodes: Optional[int] = Query(None, description="Maximum number of nodes")
 ):
     """Search workflows using semantic or keyword search."""
     try:
+        candidates = filter_workflows(category, integration, complexity, min_quality, max_nodes)
+        
         if search_type == "semantic" and semantic_search:
-            # Use semantic search
-            results = semantic_search.search(q, top_k=limit)
-            workflows = []
-            
-            for result in results:
-                workflow_data = load_workflow_by_filename(result['filename'])
-                if workflow_data:
-                    workflows.append(create_workflow_response(workflow_data, result))
+            # Use semantic search, ranking only the workflows that pass the filters
+            workflows = semantic_search_responses(q, limit, candidates)
             
             return SearchResponse(
                 query=q,
@@ -111,7 +153,7 @@ async def search_workflows(
         
         elif search_type == "keyword":
             # Use keyword search
-            workflows = keyword_search(q, limit)
+            workflows = keyword_search(q, limit, candidates)
             return SearchResponse(
                 query=q,
                 results=workflows,
@@ -121,15 +163,14 @@ async def search_workflows(
         
         elif search_type == "hybrid" and semantic_search:
             # Combine semantic and keyword search
-            semantic_results = semantic_search.search(q, top_k=limit//2)
-            keyword_results = keyword_search(q, limit//2)
+            semantic_results = semantic_search_responses(q, limit//2, candidates)
+            keyword_results = keyword_search(q, limit//2, candidates)
             
             # Combine and deduplicate
             combined = {}
             for result in semantic_results + keyword_results:
-                workflow_id = result.get('workflow_id', result.get('filename'))
-                if workflow_id not in combined:
-                    combined[workflow_id] = result
+                if result.filename not in combined:
+                    combined[result.filename] = result
             
             workflows = list(combined.values())[:limit]
             return SearchResponse(
@@ -141,7 +182,7 @@ async def search_workflows(
         
         else:
             # Fallback to keyword search
-            workflows = keyword_search(q, limit)
+            workflows = keyword_search(q, limit, candidates)
             return SearchResponse(
                 query=q,
                 results=workflows,
@@ -155,7 +196,7 @@ async def search_workflows(
 @app.get("/api/similar/{workflow_id}")
 async def find_similar_workflows(
     workflow_id: str,
-    limit: int = Query(5, description="Number of similar workflows to return")
+    limit: int = Query(5, ge=1, description="Number of similar workflows to return")
 ):
     """Find workflows similar to a specific workflow."""
     if not semantic_search:
@@ -188,87 +229,97 @@ async def get_workflow(filename: str):
             raise HTTPException(status_code=404, detail="Workflow not found")
         
         return workflow_data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading workflow: {str(e)}")
 
-@app.get("/api/categories")
-async def get_categories():
-    """Get all available categories."""
-    try:
-        categories_file = Path('indexes/categories.json')
-        if categories_file.exists():
-            with open(categories_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"categories": [], "message": "Categories index not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading categories: {str(e)}")
+def make_index_handler(filename: str, empty_key: str, label: str, summary: str):
+    """Create a handler that serves an index file with ETag support."""
+    async def handler(request: Request):
+        try:
+            return index_file_response(request, Path('indexes') / filename)
+        except FileNotFoundError:
+            return {empty_key: [], "message": f"{label} not found"}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error loading {label.lower()}: {str(e)}")
+    
+    handler.__name__ = f"get_{filename.split('.')[0]}"
+    handler.__doc__ = summary
+    return handler
 
-@app.get("/api/integrations")
-async def get_integrations():
-    """Get all available integrations."""
-    try:
-        integrations_file = Path('indexes/integrations.json')
-        if integrations_file.exists():
-            with open(integrations_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"integrations": [], "message": "Integrations index not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading integrations: {str(e)}")
+# Index files served as-is: (route, filename, key returned when missing, label, docstring)
+INDEX_ROUTES = [
+    ("/api/categories", "categories.json", "categories", "Categories index", "Get all available categories."),
+    ("/api/integrations", "integrations.json", "integrations", "Integrations index", "Get all available integrations."),
+    ("/api/quality", "quality.json", "rankings", "Quality index", "Get workflows ranked by quality score."),
+    ("/api/manifest", "manifest.json", "workflows", "Manifest", "Get the complete workflow catalog.")
+]
 
-@app.get("/api/quality")
-async def get_quality_rankings():
-    """Get workflows ranked by quality score."""
+for route, filename, empty_key, label, summary in INDEX_ROUTES:
+    app.get(route)(make_index_handler(filename, empty_key, label, summary))
+
+@app.get("/api/categories/{category}")
+async def get_category_workflows(category: str):
+    """Get all workflows for a specific category."""
     try:
-        quality_file = Path('indexes/quality.json')
-        if quality_file.exists():
-            with open(quality_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"rankings": [], "message": "Quality index not found"}
+        workflows = load_index_lookup('categories.json', 'categories').get(category.lower())
+        if workflows is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        
+        return {
+            "category": category,
+            "workflow_count": len(workflows),
+            "workflows": workflows
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading quality rankings: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error loading category: {str(e)}")
 
-@app.get("/api/manifest")
-async def get_manifest():
-    """Get the complete workflow catalog."""
+@app.get("/api/integrations/{integration}")
+async def get_integration_workflows(integration: str):
+    """Get all workflows for a specific integration."""
     try:
-        manifest_file = Path('indexes/manifest.json')
-        if manifest_file.exists():
-            with open(manifest_file, 'r') as f:
-                return json.load(f)
-        else:
-            return {"workflows": [], "message": "Manifest not found"}
+        workflows = load_index_lookup('integrations.json', 'integrations').get(integration.lower())
+        if workflows is None:
+            raise HTTPException(status_code=404, detail="Integration not found")
+        
+        return {
+            "integration": integration,
+            "workflow_count": len(workflows),
+            "workflows": workflows
+        }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error loading manifest: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error loading integration: {str(e)}")
 
 @app.get("/api/stats")
 async def get_stats():
     """Get library statistics."""
     try:
-        workflows_dir = Path('workflows')
-        workflow_files = list(workflows_dir.glob('*.json'))
+        # Scan workflows and load the indexes concurrently off the event loop
+        workflow_entries, categories_count, integrations_count, index = await asyncio.gather(
+            asyncio.to_thread(list_json_entries, Path('workflows')),
+            asyncio.to_thread(count_index_section, 'categories.json', 'total_categories', 'categories'),
+            asyncio.to_thread(count_index_section, 'integrations.json', 'total_integrations', 'integrations'),
+            asyncio.to_thread(get_search_index)
+        )
         
         # Calculate basic stats
-        total_workflows = len(workflow_files)
-        total_size = sum(f.stat().st_size for f in workflow_files)
-        
-        # Load categories and integrations for counts
-        categories_count = 0
-        integrations_count = 0
+        total_workflows = len(workflow_entries)
+        total_size = sum(entry.stat().st_size for entry in workflow_entries)
         
-        categories_file = Path('indexes/categories.json')
-        if categories_file.exists():
-            with open(categories_file, 'r') as f:
-                categories_data = json.load(f)
-                categories_count = len(categories_data.get('categories', []))
-        
-        integrations_file = Path('indexes/integrations.json')
-        if integrations_file.exists():
-            with open(integrations_file, 'r') as f:
-                integrations_data = json.load(f)
-                integrations_count = len(integrations_data.get('integrations', []))
+        # Averages and distributions over the precomputed index columns
+        average_quality = 0.0
+        average_nodes = 0.0
+        complexity_distribution = {}
+        if len(index['entries']) > 0:
+            average_quality = round(float(index['quality'].mean()), 2)
+            average_nodes = round(float(index['node_counts'].mean()), 2)
+            levels, counts = np.unique(index['complexities'], return_counts=True)
+            complexity_distribution = dict(zip(levels.tolist(), counts.tolist()))
         
         return {
             "total_workflows": total_workflows,
@@ -276,6 +327,9 @@ async def get_stats():
             "total_size_mb": round(total_size / (1024 * 1024), 2),
             "categories_count": categories_count,
             "integrations_count": integrations_count,
+            "average_quality_score": average_quality,
+            "average_node_count": average_nodes,
+            "complexity_distribution": complexity_distribution,
             "semantic_search_available": SEMANTIC_AVAILABLE and semantic_search is not None
         }
     except Exception as e:
@@ -291,49 +345,277 @@ async def health_check():
         "indexes_directory": Path('indexes').exists()
     }
 
-def load_workflow_by_filename(filename: str) -> Optional[Dict[str, Any]]:
-    """Load a workflow by filename."""
+def index_file_response(request: Request, filepath: Path) -> Response:
+    """Serve an index file as-is, answering 304 when the client's ETag is current."""
+    stat_result = os.stat(filepath)
+    etag = f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    
+    # The index on disk is already the response payload
+    return FileResponse(filepath, media_type="application/json", headers=headers, stat_result=stat_result)
+
+def list_json_entries(directory: Path) -> List[os.DirEntry]:
+    """List the JSON files in a directory with a single scandir pass."""
+    if not directory.exists():
+        return []
+    with os.scandir(directory) as it:
+        return [entry for entry in it if entry.name.endswith('.json') and entry.is_file()]
+
+def parse_json_file(filepath: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(filepath.read_bytes())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+def load_json_cached(filepath: Path) -> Optional[Any]:
+    """Load a JSON file, reusing the parsed object until the file's mtime changes."""
+    key = str(filepath)
     try:
-        filepath = Path('workflows') / filename
-        if filepath.exists():
-            with open(filepath, 'r') as f:
-                return json.load(f)
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        cached = _INDEX_CACHE.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        data = parse_json_file(filepath)
+    except FileNotFoundError:
         return None
+    
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = (mtime_ns, data)
+    return data
+
+def load_index(filename: str) -> Optional[Dict[str, Any]]:
+    """Load an index file from the indexes directory."""
+    return load_json_cached(Path('indexes') / filename)
+
+def read_index_header(filename: str) -> Dict[str, Any]:
+    """Stream the leading top-level scalar fields of an index file, stopping at its body."""
+    header = {}
+    with open(Path('indexes') / filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for prefix, event, value in ijson.parse(mm):
+            if prefix == '' or event == 'map_key':
+                continue
+            if event in ('start_map', 'start_array'):
+                break
+            header[prefix] = value
+    return header
+
+def count_index_section(filename: str, total_key: str, section: str) -> int:
+    """Count the entries in an index section, reading only the header when possible."""
+    if IJSON_AVAILABLE:
+        try:
+            header = read_index_header(filename)
+        except FileNotFoundError:
+            return 0
+        if total_key in header:
+            return int(header[total_key])
+    
+    index_data = load_index(filename)
+    if index_data is None:
+        return 0
+    return len(index_data.get(section, []))
+
+def load_index_lookup(filename: str, section: str) -> Dict[str, Any]:
+    """Return a lowercase-keyed view of one section of an index file."""
+    index_data = load_index(filename)
+    if index_data is None:
+        return {}
+    
+    # The view stays valid for as long as the cached parsed index is unchanged
+    cache_key = f"{filename}#{section}"
+    cached = _LOOKUP_CACHE.get(cache_key)
+    if cached is not None and cached[0] is index_data:
+        return cached[1]
+    
+    lookup = {key.lower(): value for key, value in index_data.get(section, {}).items()}
+    with _INDEX_CACHE_LOCK:
+        _LOOKUP_CACHE[cache_key] = (index_data, lookup)
+    return lookup
+
+def load_workflow_by_filename(filename: str) -> Optional[Dict[str, Any]]:
+    """Load a workflow by filename, keeping the most recently used ones parsed."""
+    filepath = Path('workflows') / filename
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        with _WORKFLOW_CACHE_LOCK:
+            cached = _WORKFLOW_CACHE.get(filename)
+            if cached is not None and cached[0] == mtime_ns:
+                _WORKFLOW_CACHE.move_to_end(filename)
+                return cached[1]
+        
+        data = parse_json_file(filepath)
     except Exception:
         return None
+    
+    with _WORKFLOW_CACHE_LOCK:
+        _WORKFLOW_CACHE[filename] = (mtime_ns, data)
+        _WORKFLOW_CACHE.move_to_end(filename)
+        while len(_WORKFLOW_CACHE) > WORKFLOW_CACHE_SIZE:
+            _WORKFLOW_CACHE.popitem(last=False)
+    return data
 
-def keyword_search(query: str, limit: int) -> List[Dict[str, Any]]:
-    """Simple keyword search through workflows."""
-    workflows = []
-    query_lower = query.lower()
+def index_memberships(filename: str, section: str) -> Dict[str, List[str]]:
+    """Map each workflow filename to the keys of the index section that list it."""
+    memberships = defaultdict(list)
+    for key, items in ((load_index(filename) or {}).get(section) or {}).items():
+        for item in items:
+            memberships[item.get('filename')].append(key)
+    return memberships
+
+def build_search_index() -> Dict[str, Any]:
+    """Build the in-memory search index from the workflow files and the generated indexes."""
+    entries = []
+    search_blobs = []
+    by_category = defaultdict(set)
+    by_integration = defaultdict(set)
+    by_complexity = defaultdict(set)
     
-    workflows_dir = Path('workflows')
-    for filepath in workflows_dir.glob('*.json'):
+    # Categories, integrations, complexity and quality come from the generated indexes,
+    # so the search filters agree with /api/categories, /api/integrations and friends
+    manifest = {item.get('filename'): item for item in (load_index('manifest.json') or {}).get('workflows', [])}
+    categories = index_memberships('categories.json', 'categories')
+    integrations = index_memberships('integrations.json', 'integrations')
+    
+    for dir_entry in sorted(list_json_entries(Path('workflows')), key=lambda e: e.name):
+        filepath = Path(dir_entry.path)
         try:
-            with open(filepath, 'r') as f:
-                workflow_data = json.load(f)
-                
-                # Check if query matches workflow name, description, or metadata
-                search_text = ""
-                if 'name' in workflow_data:
-                    search_text += workflow_data['name'] + " "
-                if '_metadata' in workflow_data:
-                    if 'description' in workflow_data['_metadata']:
-                        search_text += workflow_data['_metadata']['description'] + " "
-                    if 'categories' in workflow_data['_metadata']:
-                        search_text += " ".join(workflow_data['_metadata']['categories']) + " "
-                    if 'integrations' in workflow_data['_metadata']:
-                        search_text += " ".join(workflow_data['_metadata']['integrations']) + " "
-                
-                if query_lower in search_text.lower():
-                    workflows.append(create_workflow_response(workflow_data))
-                    
-                    if len(workflows) >= limit:
-                        break
+            workflow_data = parse_json_file(filepath)
         except Exception:
             continue
+        
+        metadata = workflow_data.get('_metadata', {})
+        indexed = manifest.get(filepath.name, {})
+        entry = {
+            "workflow_id": metadata.get('workflow_id', ''),
+            "name": workflow_data.get('name', 'Unknown'),
+            "filename": filepath.name,
+            "description": indexed.get('description') or metadata.get('description'),
+            "quality_score": indexed.get('quality_score'),
+            "categories": categories.get(filepath.name, []),
+            "integrations": integrations.get(filepath.name, []),
+            "node_count": len(workflow_data.get('nodes', [])),
+            "connection_count": len(workflow_data.get('connections', {})),
+            "complexity": indexed.get('complexity')
+        }
+        
+        idx = len(entries)
+        entries.append(entry)
+        search_blobs.append((entry['filename'], " ".join([
+            entry['name'],
+            entry['description'] or "",
+            " ".join(entry['categories']),
+            " ".join(entry['integrations'])
+        ]).lower()))
+        for category in entry['categories']:
+            by_category[category.lower()].add(idx)
+        for integration in entry['integrations']:
+            by_integration[integration.lower()].add(idx)
+        if entry['complexity']:
+            by_complexity[entry['complexity'].lower()].add(idx)
+    
+    return {
+        "entries": entries,
+        "rows_by_filename": {entry['filename']: idx for idx, entry in enumerate(entries)},
+        "search_blobs": search_blobs,
+        "by_category": dict(by_category),
+        "by_integration": dict(by_integration),
+        "by_complexity": dict(by_complexity),
+        # Quality scores are 0-100 and node counts are small, so narrow dtypes suffice
+        "quality": np.clip([entry['quality_score'] or 0 for entry in entries], 0, 100).astype(np.int8),
+        "node_counts": np.clip([entry['node_count'] for entry in entries], 0, np.iinfo(np.int16).max).astype(np.int16),
+        "complexities": np.array([entry['complexity'] or 'unknown' for entry in entries])
+    }
+
+def mtime_ns_or_zero(path: Path) -> int:
+    """Return a path's mtime in nanoseconds, or 0 if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+def get_search_index() -> Dict[str, Any]:
+    """Return the search index, rebuilding it if workflows or the generated indexes changed."""
+    global _search_index
+    
+    indexes_dir = Path('indexes')
+    key = (
+        mtime_ns_or_zero(Path('workflows')),
+        mtime_ns_or_zero(indexes_dir / 'manifest.json'),
+        mtime_ns_or_zero(indexes_dir / 'categories.json'),
+        mtime_ns_or_zero(indexes_dir / 'integrations.json')
+    )
+    
+    index = _search_index
+    if index is None or index['key'] != key:
+        with _SEARCH_INDEX_LOCK:
+            index = _search_index
+            if index is None or index['key'] != key:
+                index = build_search_index()
+                index['key'] = key
+                _search_index = index
+    return index
+
+def filter_workflows(category: Optional[str] = None,
+                     integration: Optional[str] = None,
+                     complexity: Optional[str] = None,
+                     min_quality: Optional[int] = None,
+                     max_nodes: Optional[int] = None) -> Optional[set]:
+    """Return the filenames matching all given filters, or None if no filter is set."""
+    if all(value is None for value in (category, integration, complexity, min_quality, max_nodes)):
+        return None
     
-    return workflows
+    index = get_search_index()
+    entries = index['entries']
+    candidates = set(range(len(entries)))
+    
+    if category is not None:
+        candidates &= index['by_category'].get(category.lower(), set())
+    if integration is not None:
+        candidates &= index['by_integration'].get(integration.lower(), set())
+    if complexity is not None:
+        candidates &= index['by_complexity'].get(complexity.lower(), set())
+    if min_quality is not None or max_nodes is not None:
+        mask = np.ones(len(entries), dtype=bool)
+        if min_quality is not None:
+            mask &= index['quality'] >= min_quality
+        if max_nodes is not None:
+            mask &= index['node_counts'] <= max_nodes
+        candidates &= set(np.flatnonzero(mask).tolist())
+    
+    return {entries[idx]['filename'] for idx in candidates}
+
+def keyword_search(query: str, limit: int, candidates: Optional[set] = None) -> List[Dict[str, Any]]:
+    """Simple keyword search through workflows."""
+    query_lower = query.lower()
+    index = get_search_index()
+    entries = index['entries']
+    
+    # Check if query matches workflow name, description, or metadata
+    matches = (
+        WorkflowResponse(**entries[idx])
+        for idx, (filename, search_blob) in enumerate(index['search_blobs'])
+        if query_lower in search_blob and (candidates is None or filename in candidates)
+    )
+    return list(islice(matches, limit))
+
+def semantic_search_responses(query: str, limit: int, candidates: Optional[set] = None) -> List[WorkflowResponse]:
+    """Run semantic search restricted to the candidate filenames and build responses from the search index."""
+    index = get_search_index()
+    rows = index['rows_by_filename']
+    
+    responses = []
+    for result in semantic_search.search(query, top_k=limit, filenames=candidates):
+        idx = rows.get(result['filename'])
+        if idx is None:
+            continue
+        response = WorkflowResponse(**index['entries'][idx])
+        response.__dict__['search_score'] = result['score']
+        responses.append(response)
+    return responses
 
 def create_workflow_response(workflow_data: Dict[str, Any], search_result: Optional[Dict[str, Any]] = None) -> WorkflowResponse:
     """Create a standardized workflow response."""
@@ -342,7 +624,8 @@ def create_workflow_response(workflow_data: Dict[str, Any], search_result: Optio
     response = WorkflowResponse(
         workflow_id=metadata.get('workflow_id', ''),
         name=workflow_data.get('name', 'Unknown'),
-        filename=workflow_data.get('_filename', ''),
+        # Workflow files don't carry their own name; search results do
+        filename=workflow_data.get('_filename') or (search_result or {}).get('filename', ''),
         description=metadata.get('description'),
         quality_score=metadata.get('quality_score'),
         categories=metadata.get('categories', []),
@@ -361,4 +644,7 @@ def create_workflow_response(workflow_data: Dict[str, Any], search_result: Optio
 if __name__ == "__main__":
     print("🚀 Starting n8n Workflow Library API...")
     print(f"🔍 Semantic search available: {SEMANTIC_AVAILABLE}")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker is a separate process with its own module-level caches
+    workers = int(os.environ.get('API_WORKERS', os.cpu_count() or 1))
+    print(f"⚙️  Workers: {workers}")
+    uvicorn.run("api:app", host="0.0.0.0", port=8000, workers=workers, loop="uvloop", http="httptools")
@@ -5,43 +5,70 @@ Create Sample Workflows - Generate test workflows with metadata for repository s
 
 import json
 import os
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
-def create_sample_workflow(name, description, categories, integrations, complexity, quality_score, node_count=8):
+# Prefer orjson for encoding/decoding workflow JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Resolved once; created by main() before any workflow is written
+WORKFLOWS_DIR = Path('workflows').resolve()
+
+# Spaces and dashes in sample names become underscores
+FILENAME_TRANS = str.maketrans(' -', '__')
+
+NODE_TEMPLATE = {"id": "", "name": "", "type": "", "position": [0, 0], "parameters": {}}
+
+def make_node(i, node_type):
+    """Create the i-th sample node from NODE_TEMPLATE."""
+    node = NODE_TEMPLATE.copy()
+    node["id"] = f"node-{i}"
+    node["name"] = f"Node {i+1}"
+    node["type"] = node_type
+    node["position"] = [i * 200, i * 100]
+    node["parameters"] = {}
+    return node
+
+def make_sticky_note(name, description, categories):
+    """Create the documentation sticky note that opens each sample workflow."""
+    node = NODE_TEMPLATE.copy()
+    node["id"] = "node-0"
+    node["name"] = "Documentation"
+    node["type"] = "n8n-nodes-base.stickyNote"
+    node["position"] = [0, 0]
+    node["parameters"] = {
+        "content": f"# {name}\n\n{description}\n\nThis workflow demonstrates {', '.join(categories)} functionality."
+    }
+    return node
+
+def encode_workflow_json(data, pretty=False):
+    """Encode workflow JSON compactly (or indented when pretty), using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None).encode()
+
+def create_sample_workflow(name, description, categories, integrations, complexity, quality_score, node_count=8, now=None):
     """Create a sample workflow with metadata."""
+    now = now or datetime.now(timezone.utc).isoformat()
     
-    # Create sample nodes
-    nodes = []
-    for i in range(node_count):
-        node = {
-            "id": f"node-{i}",
-            "name": f"Node {i+1}",
-            "type": f"n8n-nodes-base.{integrations[0] if integrations else 'httpRequest'}",
-            "position": [i * 200, i * 100],
-            "parameters": {}
-        }
-        
-        # Add sticky note for documentation
-        if i == 0:
-            node = {
-                "id": f"node-{i}",
-                "name": "Documentation",
-                "type": "n8n-nodes-base.stickyNote",
-                "position": [0, 0],
-                "parameters": {
-                    "content": f"# {name}\n\n{description}\n\nThis workflow demonstrates {', '.join(categories)} functionality."
-                }
-            }
-        
-        nodes.append(node)
+    # Create sample nodes from the shared template; node 0 is the documentation note
+    node_type = f"n8n-nodes-base.{integrations[0] if integrations else 'httpRequest'}"
+    nodes = [
+        make_sticky_note(name, description, categories) if i == 0 else make_node(i, node_type)
+        for i in range(node_count)
+    ]
     
     # Create sample connections
-    connections = {}
-    for i in range(len(nodes) - 1):
-        connections[f"node-{i}"] = {
-            "main": [[{"node": f"node-{i+1}", "type": "main", "index": 0}]]
-        }
+    connections = {
+        f"node-{i}": {"main": [[{"node": f"node-{i+1}", "type": "main", "index": 0}]]}
+        for i in range(len(nodes) - 1)
+    }
     
     # Create workflow data
     workflow_data = {
@@ -53,14 +80,14 @@ def create_sample_workflow(name, description, categories, integrations, complexi
         "staticData": {},
         "tags": [],
         "triggerCount": 1,
-        "updatedAt": datetime.now().isoformat(),
+        "updatedAt": now,
         "versionId": "1"
     }
     
     # Create metadata
     metadata = {
         "workflow_name": name,
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": now,
         "source_url": f"https://n8n.io/workflows/sample-{name.lower().replace(' ', '-')}",
         "node_count": len(nodes),
         "connection_count": len(connections),
@@ -81,8 +108,24 @@ def create_sample_workflow(name, description, categories, integrations, complexi
     
     return enhanced_workflow
 
+def encode_sample_workflow(workflow_spec, now, pretty=False):
+    """Build one sample workflow and return its (filename, encoded JSON) pair."""
+    workflow_data = create_sample_workflow(now=now, **workflow_spec)
+    
+    # Generate filename
+    safe_name = workflow_spec['name'].translate(FILENAME_TRANS)
+    filename = f"{safe_name}.json"
+    
+    return filename, encode_workflow_json(workflow_data, pretty)
+
 def main():
     """Create sample workflows for testing."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Create sample workflows for testing')
+    parser.add_argument('--pretty', action='store_true', help='Indent saved workflow JSON')
+    args = parser.parse_args()
+    
     print("🚀 Creating Sample n8n Workflows")
     print("=" * 50)
     
@@ -163,26 +206,25 @@ def main():
     ]
     
     # Create workflows directory if it doesn't exist
-    workflows_dir = Path('workflows')
-    workflows_dir.mkdir(exist_ok=True)
+    WORKFLOWS_DIR.mkdir(exist_ok=True)
+    
+    # All samples share one creation timestamp
+    now = datetime.now(timezone.utc).isoformat()
+    encode = partial(encode_sample_workflow, now=now, pretty=args.pretty)
+    
+    # Encode every workflow across processes, then overlap the file writes on threads
+    with ProcessPoolExecutor() as executor:
+        payloads = list(executor.map(encode, sample_workflows))
+    
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda p: (WORKFLOWS_DIR / p[0]).write_bytes(p[1]), payloads))
+    
+    filenames = [filename for filename, _ in payloads]
     
     created_count = 0
     
-    for i, workflow_spec in enumerate(sample_workflows, 1):
-        print(f"\n📝 [{i}/{len(sample_workflows)}] Creating: {workflow_spec['name']}")
-        
-        # Create the workflow
-        workflow_data = create_sample_workflow(**workflow_spec)
-        
-        # Generate filename
-        safe_name = workflow_spec['name'].replace(' ', '_').replace('-', '_')
-        filename = f"{safe_name}.json"
-        filepath = workflows_dir / filename
-        
-        # Save workflow
-        with open(filepath, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
-        
+    for i, (workflow_spec, filename) in enumerate(zip(sample_workflows, filenames), 1):
+        print(f"\n📝 [{i}/{len(sample_workflows)}] Created: {workflow_spec['name']}")
         print(f"  💾 Saved: {filename}")
         print(f"  📊 Quality: {workflow_spec['quality_score']}/100")
         print(f"  🏷️  Categories: {', '.join(workflow_spec['categories'])}")
@@ -202,7 +244,7 @@ def main():
     except Exception as e:
         print(f"❌ Error generating indexes: {e}")
     
-    print(f"\n📁 Total workflows: {len(list(workflows_dir.glob('*.json')))}")
+    print(f"\n📁 Total workflows: {len(list(WORKFLOWS_DIR.glob('*.json')))}")
     print("🚀 Ready for GitHub repository setup!")
 
 if __name__ == "__main__":
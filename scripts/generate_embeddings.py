@@ -7,61 +7,85 @@ Creates vector embeddings for all workflows using TF-IDF approach
 import json
 import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
 from sklearn.metrics.pairwise import cosine_similarity
-import jsonlines
 from tqdm import tqdm
 from slugify import slugify
 
+# Prefer orjson for reading and writing JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# LZ4 gives joblib fast-loading compression; fall back to zlib without it
+try:
+    import lz4
+    VECTORIZER_COMPRESSION = ('lz4', 3)
+except ImportError:
+    VECTORIZER_COMPRESSION = 3
+
+# The corpus has ~70k distinct unigrams and bigrams; a wide hash space keeps collisions rare
+HASH_FEATURES = 2 ** 20
+
+def load_workflow_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """Parse one workflow file and tag it with its filename, or return None on error."""
+    try:
+        data = file_path.read_bytes()
+        workflow_data = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        workflow_data['_filename'] = file_path.name
+        return workflow_data
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        return None
+
 def load_workflows() -> List[Dict[str, Any]]:
     """Load all workflows from the workflows directory."""
     workflows_dir = Path('workflows')
-    workflows = []
-    
-    for file_path in workflows_dir.glob('*.json'):
-        try:
-            with open(file_path, 'r') as f:
-                workflow_data = json.load(f)
-                workflow_data['_filename'] = file_path.name
-                workflows.append(workflow_data)
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
-    
-    return workflows
+    
+    # Read and parse the files across processes
+    files = list(workflows_dir.glob('*.json'))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        loaded = executor.map(load_workflow_file, files, chunksize=32)
+        return [workflow for workflow in loaded if workflow is not None]
 
-def create_search_text(workflow: Dict[str, Any]) -> str:
-    """Create searchable text from workflow data."""
-    text_parts = []
-    
-    # Add workflow name
-    if 'name' in workflow:
-        text_parts.append(workflow['name'])
-    
-    # Add metadata description
-    if '_metadata' in workflow and 'description' in workflow['_metadata']:
-        text_parts.append(workflow['_metadata']['description'])
-    
-    # Add node names and types
-    if 'nodes' in workflow:
-        for node in workflow['nodes']:
-            if 'name' in node:
-                text_parts.append(node['name'])
-            if 'type' in node:
-                text_parts.append(node['type'])
-    
-    # Add integrations
-    if '_metadata' in workflow and 'integrations' in workflow['_metadata']:
-        text_parts.extend(workflow['_metadata']['integrations'])
-    
-    # Add categories
-    if '_metadata' in workflow and 'categories' in workflow['_metadata']:
-        text_parts.extend(workflow['_metadata']['categories'])
-    
-    return ' '.join(text_parts)
+def save_json(filepath: Path, data: Any) -> None:
+    """Atomically write JSON with two-space indentation, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    
+    # Write beside the target and rename so readers never see a partial file
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, filepath)
+
+def create_search_texts(workflows: List[Dict[str, Any]]) -> List[str]:
+    """Create searchable text for each workflow from column-wise field lists."""
+    metadata = [workflow.get('_metadata', {}) for workflow in workflows]
+    names = [workflow.get('name', '') for workflow in workflows]
+    descriptions = [meta.get('description', '') for meta in metadata]
+    node_texts = [
+        ' '.join(f"{node.get('name', '')} {node.get('type', '')}" for node in workflow.get('nodes', []))
+        for workflow in workflows
+    ]
+    integrations = [' '.join(meta.get('integrations', [])) for meta in metadata]
+    categories = [' '.join(meta.get('categories', [])) for meta in metadata]
+    
+    return [
+        ' '.join(filter(None, parts))
+        for parts in zip(names, descriptions, node_texts, integrations, categories)
+    ]
 
 def generate_persistent_id(workflow: Dict[str, Any]) -> str:
     """Generate a persistent ID for the workflow."""
@@ -86,44 +110,49 @@ def generate_embeddings():
         return
     
     # Prepare data for embedding
-    search_texts = []
     workflow_ids = []
     workflow_data = []
+    needs_update = []
     
     print("📝 Preparing workflow data...")
     for workflow in tqdm(workflows, desc="Processing workflows"):
         # Generate persistent ID
         workflow_id = generate_persistent_id(workflow)
         
-        # Add persistent ID to metadata
+        # Add persistent ID to metadata; IDs are deterministic, so most files already have it
         if '_metadata' not in workflow:
             workflow['_metadata'] = {}
-        workflow['_metadata']['workflow_id'] = workflow_id
+        if workflow['_metadata'].get('workflow_id') != workflow_id:
+            workflow['_metadata']['workflow_id'] = workflow_id
+            needs_update.append(workflow)
         
-        # Create searchable text
-        search_text = create_search_text(workflow)
-        
-        search_texts.append(search_text)
         workflow_ids.append(workflow_id)
         workflow_data.append(workflow)
     
+    # Create searchable text for all workflows at once
+    search_texts = create_search_texts(workflow_data)
+    
     # Generate TF-IDF embeddings
     print("🔍 Generating TF-IDF embeddings...")
-    vectorizer = TfidfVectorizer(
-        max_features=1000,
-        stop_words='english',
-        ngram_range=(1, 2),
-        min_df=1,
-        max_df=0.9
-    )
+    # Hashing skips the vocabulary build and keeps it out of the saved artifact
+    vectorizer = Pipeline([
+        ('h', HashingVectorizer(
+            n_features=HASH_FEATURES,
+            alternate_sign=False,
+            ngram_range=(1, 2),
+            stop_words='english',
+            dtype=np.float32
+        )),
+        ('t', TfidfTransformer())
+    ])
     
     # Fit and transform the text data
     tfidf_matrix = vectorizer.fit_transform(search_texts)
     
-    # Convert to dense array for storage
-    embeddings = tfidf_matrix.toarray()
+    # Keep the matrix sparse; most TF-IDF weights are zero
+    tfidf_matrix = tfidf_matrix.tocsr()
     
-    print(f"✅ Generated embeddings with {embeddings.shape[1]} features")
+    print(f"✅ Generated embeddings with {tfidf_matrix.shape[1]} features")
     
     # Save embeddings and metadata
     print("💾 Saving embeddings and metadata...")
@@ -131,23 +160,29 @@ def generate_embeddings():
     indexes_dir.mkdir(exist_ok=True)
     
     # Save TF-IDF vectorizer
-    import pickle
-    with open(indexes_dir / 'tfidf_vectorizer.pkl', 'wb') as f:
-        pickle.dump(vectorizer, f)
-    
-    # Save embeddings metadata
-    embeddings_data = []
-    for i, (workflow_id, search_text, embedding) in enumerate(zip(workflow_ids, search_texts, embeddings)):
-        embeddings_data.append({
-            'workflow_id': workflow_id,
-            'filename': workflow_data[i]['_filename'],
-            'search_text': search_text,
-            'embedding': embedding.tolist()
-        })
-    
-    with jsonlines.open(indexes_dir / 'embeddings.jsonl', 'w') as writer:
-        for item in embeddings_data:
-            writer.write(item)
+    joblib.dump(vectorizer, indexes_dir / 'tfidf_vectorizer.joblib', compress=VECTORIZER_COMPRESSION)
+    
+    # Save the sparse embeddings matrix and the workflow ID of each row
+    scipy.sparse.save_npz(indexes_dir / 'embeddings.npz', tfidf_matrix)
+    save_json(indexes_dir / 'embedding_ids.json', workflow_ids)
+    
+    # Search is exact over the sparse matrix; remove the HNSW graph older runs wrote
+    (indexes_dir / 'hnsw.bin').unlink(missing_ok=True)
+    
+    # Stream embeddings metadata, with each row's non-zero entries, straight to disk
+    indptr = tfidf_matrix.indptr
+    with open(indexes_dir / 'embeddings.jsonl', 'wb', buffering=1 << 20) as f:
+        for i, (workflow_id, search_text) in enumerate(zip(workflow_ids, search_texts)):
+            start, end = indptr[i], indptr[i + 1]
+            item = {
+                'workflow_id': workflow_id,
+                'filename': workflow_data[i]['_filename'],
+                'search_text': search_text,
+                'indices': tfidf_matrix.indices[start:end].tolist(),
+                'data': tfidf_matrix.data[start:end].tolist()
+            }
+            f.write(orjson.dumps(item) if ORJSON_AVAILABLE else json.dumps(item).encode())
+            f.write(b"\n")
     
     # Save workflow ID mappings
     workflow_id_mappings = {
@@ -159,19 +194,16 @@ def generate_embeddings():
         for workflow_id, workflow, search_text in zip(workflow_ids, workflow_data, search_texts)
     }
     
-    with open(indexes_dir / 'workflow_ids.json', 'w') as f:
-        json.dump(workflow_id_mappings, f, indent=2)
+    save_json(indexes_dir / 'workflow_ids.json', workflow_id_mappings)
     
-    # Update workflows with persistent IDs
-    print("📝 Updating workflows with persistent IDs...")
-    for workflow in workflows:
+    # Update workflows that were missing their persistent ID
+    print(f"📝 Updating {len(needs_update)} workflows with persistent IDs...")
+    for workflow in needs_update:
         filename = workflow['_filename']
-        filepath = Path('workflows') / filename
-        with open(filepath, 'w') as f:
-            json.dump(workflow, f, indent=2)
+        save_json(Path('workflows') / filename, {k: v for k, v in workflow.items() if k != '_filename'})
     
     print(f"✅ Generated embeddings for {len(workflows)} workflows")
-    print(f"📁 Saved to: indexes/tfidf_vectorizer.pkl, indexes/embeddings.jsonl, indexes/workflow_ids.json")
+    print(f"📁 Saved to: indexes/tfidf_vectorizer.joblib, indexes/embeddings.npz, indexes/embedding_ids.json, indexes/embeddings.jsonl, indexes/workflow_ids.json")
 
 if __name__ == "__main__":
     generate_embeddings()
@@ -8,108 +8,109 @@ import os
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Prefer orjson for reading and writing JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def load_workflow_file(file):
+    """Parse one workflow file and tag it with its filename, returning None if it can't be read."""
+    try:
+        data = file.read_bytes()
+        workflow = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        workflow['_filename'] = file.name
+        return workflow
+    except Exception as e:
+        print(f"❌ Error loading {file}: {e}")
+        return None
 
 def load_workflows():
     """Load all workflows from the workflows directory."""
     workflows_dir = Path('workflows')
-    workflows = []
     
     if not workflows_dir.exists():
         print("❌ Workflows directory not found")
-        return workflows
+        return []
     
-    for file in workflows_dir.glob('*.json'):
-        try:
-            with open(file, 'r') as f:
-                workflow_data = json.load(f)
-                workflows.append(workflow_data)
-        except Exception as e:
-            print(f"❌ Error loading {file}: {e}")
+    # Read and parse the files across processes
+    files = list(workflows_dir.glob('*.json'))
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        loaded = executor.map(load_workflow_file, files, chunksize=32)
+        workflows = [workflow for workflow in loaded if workflow is not None]
     
     print(f"✅ Loaded {len(workflows)} workflows")
     return workflows
 
-def generate_manifest(workflows):
-    """Generate manifest.json - master catalog of all workflows."""
-    manifest = {
-        "generated_at": datetime.now().isoformat(),
-        "total_workflows": len(workflows),
-        "workflows": []
-    }
-    
-    for workflow in workflows:
-        metadata = workflow.get('_metadata', {})
-        manifest_entry = {
-            "filename": f"{metadata.get('workflow_name', 'Unknown')}.json",
-            "name": metadata.get('workflow_name', 'Unknown'),
-            "description": metadata.get('description', ''),
-            "categories": metadata.get('categories', []),
-            "integrations": metadata.get('integrations', []),
-            "complexity": metadata.get('complexity', 'unknown'),
-            "quality_score": metadata.get('quality_score', 0),
-            "node_count": metadata.get('node_count', 0),
-            "connection_count": metadata.get('connection_count', 0),
-            "scraped_at": metadata.get('scraped_at', ''),
-            "source_url": metadata.get('source_url', '')
-        }
-        manifest["workflows"].append(manifest_entry)
+def generate_indexes(workflows):
+    """Build the manifest, categories, quality and integrations indexes in a single pass."""
+    generated_at = datetime.now().isoformat()
     
-    # Sort by quality score (highest first)
-    manifest["workflows"].sort(key=lambda x: x["quality_score"], reverse=True)
-    
-    return manifest
-
-def generate_categories_index(workflows):
-    """Generate categories.json - workflows grouped by category."""
+    manifest_entries = []
     categories = defaultdict(list)
-    
-    for workflow in workflows:
-        metadata = workflow.get('_metadata', {})
-        workflow_categories = metadata.get('categories', ['general'])
-        
-        for category in workflow_categories:
-            categories[category].append({
-                "filename": f"{metadata.get('workflow_name', 'Unknown')}.json",
-                "name": metadata.get('workflow_name', 'Unknown'),
-                "description": metadata.get('description', ''),
-                "quality_score": metadata.get('quality_score', 0),
-                "complexity": metadata.get('complexity', 'unknown'),
-                "node_count": metadata.get('node_count', 0)
-            })
-    
-    # Sort workflows within each category by quality score
-    for category in categories:
-        categories[category].sort(key=lambda x: x["quality_score"], reverse=True)
-    
-    # Convert to regular dict and add metadata
-    result = {
-        "generated_at": datetime.now().isoformat(),
-        "total_categories": len(categories),
-        "categories": dict(categories)
-    }
-    
-    return result
-
-def generate_quality_index(workflows):
-    """Generate quality.json - workflows ranked by quality score."""
     quality_tiers = {
         "excellent": [],
         "good": [],
         "fair": [],
         "basic": []
     }
+    integrations = defaultdict(list)
+    integration_stats = Counter()
     
     for workflow in workflows:
         metadata = workflow.get('_metadata', {})
+        
+        # Read each metadata field once and share it across the indexes
+        name = metadata.get('workflow_name', 'Unknown')
+        # Point at the file on disk so the API can join index entries to workflows
+        filename = workflow.get('_filename', f"{name}.json")
+        description = metadata.get('description', '')
+        workflow_categories = metadata.get('categories', [])
+        workflow_integrations = metadata.get('integrations', [])
+        complexity = metadata.get('complexity', 'unknown')
         quality_score = metadata.get('quality_score', 0)
+        node_count = metadata.get('node_count', 0)
         
+        # manifest.json - master catalog of all workflows
+        manifest_entries.append({
+            "filename": filename,
+            "name": name,
+            "description": description,
+            "categories": workflow_categories,
+            "integrations": workflow_integrations,
+            "complexity": complexity,
+            "quality_score": quality_score,
+            "node_count": node_count,
+            "connection_count": metadata.get('connection_count', 0),
+            "scraped_at": metadata.get('scraped_at', ''),
+            "source_url": metadata.get('source_url', '')
+        })
+        
+        # categories.json - workflows grouped by category
+        grouped_categories = metadata.get('categories', ['general'])
+        if grouped_categories:
+            category_entry = {
+                "filename": filename,
+                "name": name,
+                "description": description,
+                "quality_score": quality_score,
+                "complexity": complexity,
+                "node_count": node_count
+            }
+            for category in grouped_categories:
+                categories[category].append(category_entry)
+        
+        # quality.json - workflows ranked by quality score
         entry = {
-            "filename": f"{metadata.get('workflow_name', 'Unknown')}.json",
-            "name": metadata.get('workflow_name', 'Unknown'),
-            "description": metadata.get('description', ''),
-            "categories": metadata.get('categories', []),
-            "complexity": metadata.get('complexity', 'unknown'),
-            "node_count": metadata.get('node_count', 0)
+            "filename": filename,
+            "name": name,
+            "description": description,
+            "categories": workflow_categories,
+            "complexity": complexity,
+            "node_count": node_count
         }
         
         if quality_score >= 80:
@@ -120,13 +121,44 @@ def generate_quality_index(workflows):
             quality_tiers["fair"].append(entry)
         else:
             quality_tiers["basic"].append(entry)
+        
+        # integrations.json - workflows grouped by integration
+        if workflow_integrations:
+            integration_entry = {
+                "filename": filename,
+                "name": name,
+                "description": description,
+                "categories": workflow_categories,
+                "quality_score": quality_score,
+                "complexity": complexity
+            }
+            for integration in workflow_integrations:
+                integrations[integration].append(integration_entry)
+                integration_stats[integration] += 1
     
-    # Sort within each tier by quality score
+    # Sort by quality score (highest first)
+    manifest_entries.sort(key=lambda x: x["quality_score"], reverse=True)
+    for category in categories:
+        categories[category].sort(key=lambda x: x["quality_score"], reverse=True)
     for tier in quality_tiers:
         quality_tiers[tier].sort(key=lambda x: x.get("quality_score", 0), reverse=True)
+    for integration in integrations:
+        integrations[integration].sort(key=lambda x: x["quality_score"], reverse=True)
+    
+    manifest = {
+        "generated_at": generated_at,
+        "total_workflows": len(workflows),
+        "workflows": manifest_entries
+    }
     
-    result = {
-        "generated_at": datetime.now().isoformat(),
+    categories_index = {
+        "generated_at": generated_at,
+        "total_categories": len(categories),
+        "categories": dict(categories)
+    }
+    
+    quality_index = {
+        "generated_at": generated_at,
         "quality_tiers": quality_tiers,
         "summary": {
             "excellent": len(quality_tiers["excellent"]),
@@ -136,41 +168,14 @@ def generate_quality_index(workflows):
         }
     }
     
-    return result
-
-def generate_integrations_index(workflows):
-    """Generate integrations.json - workflows grouped by integration."""
-    integrations = defaultdict(list)
-    integration_stats = Counter()
-    
-    for workflow in workflows:
-        metadata = workflow.get('_metadata', {})
-        workflow_integrations = metadata.get('integrations', [])
-        
-        for integration in workflow_integrations:
-            integrations[integration].append({
-                "filename": f"{metadata.get('workflow_name', 'Unknown')}.json",
-                "name": metadata.get('workflow_name', 'Unknown'),
-                "description": metadata.get('description', ''),
-                "categories": metadata.get('categories', []),
-                "quality_score": metadata.get('quality_score', 0),
-                "complexity": metadata.get('complexity', 'unknown')
-            })
-            integration_stats[integration] += 1
-    
-    # Sort workflows within each integration by quality score
-    for integration in integrations:
-        integrations[integration].sort(key=lambda x: x["quality_score"], reverse=True)
-    
-    # Convert to regular dict and add metadata
-    result = {
-        "generated_at": datetime.now().isoformat(),
+    integrations_index = {
+        "generated_at": generated_at,
         "total_integrations": len(integrations),
         "integration_stats": dict(integration_stats),
         "integrations": dict(integrations)
     }
     
-    return result
+    return manifest, categories_index, quality_index, integrations_index
 
 def save_index(index_data, filename):
     """Save index to JSON file."""
@@ -178,8 +183,11 @@ def save_index(index_data, filename):
     indexes_dir.mkdir(exist_ok=True)
     
     filepath = indexes_dir / filename
-    with open(filepath, 'w') as f:
-        json.dump(index_data, f, indent=2)
+    # Encode once and write once; keys keep insertion order so the totals stay ahead of the bodies
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(index_data, option=orjson.OPT_INDENT_2))
+    else:
+        filepath.write_bytes(json.dumps(index_data, indent=2).encode())
     
     print(f"💾 Saved {filename}")
 
@@ -197,25 +205,18 @@ def main():
     
     # Generate indexes
     print("\n📊 Generating indexes...")
+    manifest, categories, quality, integrations = generate_indexes(workflows)
     
     # 1. Manifest (master catalog)
-    print("  📋 Generating manifest.json...")
-    manifest = generate_manifest(workflows)
     save_index(manifest, "manifest.json")
     
     # 2. Categories index
-    print("  🏷️  Generating categories.json...")
-    categories = generate_categories_index(workflows)
     save_index(categories, "categories.json")
     
     # 3. Quality index
-    print("  ⭐ Generating quality.json...")
-    quality = generate_quality_index(workflows)
     save_index(quality, "quality.json")
     
     # 4. Integrations index
-    print("  🔗 Generating integrations.json...")
-    integrations = generate_integrations_index(workflows)
     save_index(integrations, "integrations.json")
     
     # Print summary
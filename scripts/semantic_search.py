@@ -6,12 +6,29 @@ Uses TF-IDF embeddings for similarity search
 
 import json
 import numpy as np
+import scipy.sparse
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import jsonlines
 import pickle
+import joblib
+
+# Prefer orjson for parsing the index files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without sorting the whole array."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    candidates = np.argpartition(scores, -k)[-k:]
+    return candidates[np.argsort(scores[candidates])[::-1]]
 
 class SemanticSearch:
     def __init__(self):
@@ -19,14 +36,23 @@ class SemanticSearch:
         self.embeddings_matrix = None
         self.workflow_ids = {}
         self.embeddings_data = []
+        self.id_to_index = {}
+        self.filename_to_index = {}
         self.loaded = False
     
+    def read_json(self, filepath: Path) -> Any:
+        """Parse a JSON file, using orjson when installed."""
+        data = filepath.read_bytes()
+        return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    
     def load_index(self):
         """Load the TF-IDF vectorizer and metadata."""
         indexes_dir = Path('indexes')
         
-        # Load TF-IDF vectorizer
-        if (indexes_dir / 'tfidf_vectorizer.pkl').exists():
+        # Load TF-IDF vectorizer (older indexes stored it as a plain pickle)
+        if (indexes_dir / 'tfidf_vectorizer.joblib').exists():
+            self.vectorizer = joblib.load(indexes_dir / 'tfidf_vectorizer.joblib')
+        elif (indexes_dir / 'tfidf_vectorizer.pkl').exists():
             with open(indexes_dir / 'tfidf_vectorizer.pkl', 'rb') as f:
                 self.vectorizer = pickle.load(f)
         else:
@@ -34,11 +60,26 @@ class SemanticSearch:
         
         # Load workflow ID mappings
         if (indexes_dir / 'workflow_ids.json').exists():
-            with open(indexes_dir / 'workflow_ids.json', 'r') as f:
-                self.workflow_ids = json.load(f)
+            self.workflow_ids = self.read_json(indexes_dir / 'workflow_ids.json')
         else:
             raise FileNotFoundError("Workflow IDs mapping not found. Run generate_embeddings.py first.")
         
+        # Binary matrix plus row IDs: row metadata comes from the ID mapping, no JSONL parse
+        if (indexes_dir / 'embeddings.npz').exists() and (indexes_dir / 'embedding_ids.json').exists():
+            self.embeddings_matrix = scipy.sparse.load_npz(indexes_dir / 'embeddings.npz')
+            self.embeddings_data = [
+                {
+                    'workflow_id': workflow_id,
+                    'filename': self.workflow_ids[workflow_id]['filename'],
+                    'search_text': self.workflow_ids[workflow_id]['search_text']
+                }
+                for workflow_id in self.read_json(indexes_dir / 'embedding_ids.json')
+            ]
+            self.embeddings_matrix = normalize(self.embeddings_matrix, norm='l2', copy=False)
+            self.build_id_lookup()
+            self.loaded = True
+            return
+        
         # Load embeddings metadata
         if (indexes_dir / 'embeddings.jsonl').exists():
             self.embeddings_data = []
@@ -48,33 +89,60 @@ class SemanticSearch:
         else:
             raise FileNotFoundError("Embeddings metadata not found. Run generate_embeddings.py first.")
         
-        # Create embeddings matrix
-        self.embeddings_matrix = np.array([item['embedding'] for item in self.embeddings_data])
+        # Load the sparse embeddings matrix; older indexes only have dense rows in the JSONL
+        if (indexes_dir / 'embeddings.npz').exists():
+            self.embeddings_matrix = scipy.sparse.load_npz(indexes_dir / 'embeddings.npz')
+        else:
+            self.embeddings_matrix = np.array([item['embedding'] for item in self.embeddings_data], dtype=np.float32)
+        self.embeddings_matrix = normalize(self.embeddings_matrix, norm='l2', copy=False)
+        self.build_id_lookup()
         self.loaded = True
     
-    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Search for similar workflows."""
+    def build_id_lookup(self):
+        """Map each workflow ID and filename to its row in the embeddings matrix."""
+        self.id_to_index = {item['workflow_id']: i for i, item in enumerate(self.embeddings_data)}
+        self.filename_to_index = {item['filename']: i for i, item in enumerate(self.embeddings_data)}
+    
+    def similarities(self, vector, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of an L2-normalized row vector against the stored embeddings (or just `rows`)."""
+        matrix = self.embeddings_matrix if rows is None else self.embeddings_matrix[rows]
+        scores = matrix @ vector.T
+        if scipy.sparse.issparse(scores):
+            scores = scores.toarray()
+        return np.asarray(scores).ravel()
+    
+    def search(self, query: str, top_k: int = 5, filenames: Optional[set] = None) -> List[Dict[str, Any]]:
+        """Search for similar workflows, optionally only among the given filenames."""
         if not self.loaded:
             self.load_index()
         
         # Transform the query using the same vectorizer
-        query_vector = self.vectorizer.transform([query]).toarray()
+        query_vector = normalize(self.vectorizer.transform([query]))
         
-        # Calculate cosine similarity
-        similarities = cosine_similarity(query_vector, self.embeddings_matrix)[0]
+        # Calculate cosine similarity (rows are pre-normalized, so this is one matmul)
+        if filenames is None:
+            rows = None
+        else:
+            # Score only the allowed rows so a selective filter still fills top_k
+            rows = np.array(sorted(self.filename_to_index[f] for f in filenames if f in self.filename_to_index), dtype=np.intp)
+            if len(rows) == 0:
+                return []
+        similarities = self.similarities(query_vector, rows)
         
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Get top-k indices, mapped back to embedding rows when scoring a subset
+        top_positions = top_k_indices(similarities, top_k)
+        top_scores = similarities[top_positions]
+        top_indices = top_positions if rows is None else rows[top_positions]
         
         # Format results
         results = []
-        for i, idx in enumerate(top_indices):
+        for i, (idx, score) in enumerate(zip(top_indices, top_scores)):
             embedding_item = self.embeddings_data[idx]
             workflow_id = embedding_item['workflow_id']
             
             result = {
                 'rank': i + 1,
-                'score': float(similarities[idx]),
+                'score': float(score),
                 'workflow_id': workflow_id,
                 'filename': embedding_item['filename'],
                 'name': self.workflow_ids.get(workflow_id, {}).get('name', 'Unknown'),
@@ -90,23 +158,19 @@ class SemanticSearch:
             self.load_index()
         
         # Find the workflow's embedding
-        workflow_idx = None
-        for i, item in enumerate(self.embeddings_data):
-            if item['workflow_id'] == workflow_id:
-                workflow_idx = i
-                break
+        workflow_idx = self.id_to_index.get(workflow_id)
         
         if workflow_idx is None:
             return []
         
         # Get the workflow's embedding
-        workflow_embedding = np.array(self.embeddings_data[workflow_idx]['embedding']).reshape(1, -1)
+        workflow_embedding = self.embeddings_matrix[workflow_idx:workflow_idx + 1]
         
         # Calculate cosine similarity with all other workflows
-        similarities = cosine_similarity(workflow_embedding, self.embeddings_matrix)[0]
+        similarities = self.similarities(workflow_embedding)
         
         # Get top-k indices (excluding the workflow itself)
-        top_indices = np.argsort(similarities)[::-1][1:top_k+1]
+        top_indices = [idx for idx in top_k_indices(similarities, top_k + 1) if idx != workflow_idx][:top_k]
         
         # Format results
         results = []
@@ -11,231 +11,410 @@ import time
 import json
 import re
 import html
+import logging
+import sys
+import os
 import random
+import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
-def setup_driver():
-    """Setup Chrome driver."""
+log = logging.getLogger("scraper")
+
+# Prefer orjson for encoding/decoding workflow JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# selectolax lets the arena listing be parsed without starting a browser
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+WORKFLOW_LINK_SELECTOR = 'a[href*="n8n.io/workflows/"]'
+# Finds the first clickable element whose text contains arguments[0] in one script call
+FIND_BY_TEXT_JS = """
+const t = arguments[0];
+for (const el of document.querySelectorAll('button, a, [role=button]')) {
+    if ((el.textContent || '').toLowerCase().includes(t)) return el;
+}
+return null;
+"""
+CLICK_JS = "arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();"
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.woff2", "*.woff", "*.ttf", "*.mp4", "*.webm",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*"
+]
+
+ARENA_URL = "https://n8narena.com/workflows/"
+TEMPLATE_API_URL = "https://api.n8n.io/api/workflows/templates/{}"
+
+# Compiled once; used on every scraped page and URL
+N8N_DEMO_RE = re.compile(rb'<n8n-demo[^>]*workflow="([^"]*)"', re.I)
+WORKFLOW_ID_RE = re.compile(r"/workflows/(\d+)(?:-([^/?#]*))?")
+
+# Maps spaces and characters that are illegal in filenames to underscores
+FILENAME_TRANS = str.maketrans({c: '_' for c in ' /:\\?*"<>|'})
+
+# Resolved once; created by main() before any workflow is written
+WORKFLOWS_DIR = Path('workflows').resolve()
+
+# Reused across runs so n8n.io's scripts and styles come from the warm disk cache
+PROFILE_ROOT = Path.home() / ".cache" / "n8n_scraper_profile"
+DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# Shared HTTP session so template API calls reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+SESSION.headers["User-Agent"] = "Mozilla/5.0 (compatible; n8n-workflow-library/1.0)"
+
+def configure_logging(verbose=False, quiet=False):
+    """Send scraper log messages to stdout at the requested verbosity."""
+    logging.basicConfig(format="%(message)s", level=logging.WARNING, stream=sys.stdout)
+    log.setLevel(logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO)
+
+def setup_driver(worker_id=0):
+    """Setup Chrome driver with a persistent, per-worker profile and disk cache."""
+    # Chrome locks its profile directory, so each concurrent driver needs its own
+    profile_dir = PROFILE_ROOT / f"worker-{worker_id}"
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    
     options = Options()
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument(f"--disk-cache-size={DISK_CACHE_BYTES}")
+    options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from driver.get() at DOMContentLoaded; explicit waits cover the rest
+    options.page_load_strategy = "eager"
     
     try:
         driver = webdriver.Chrome(options=options)
-        return driver
     except:
-        print("❌ Chrome not found. Please install Chrome browser.")
+        log.error("❌ Chrome not found. Please install Chrome browser.")
         return None
+    
+    # Skip images, fonts, media and analytics the scraper never reads
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        log.warning(f"⚠️ Could not enable resource blocking: {e}")
+    
+    return driver
+
+def wait_for_element_by_text(driver, text, timeout):
+    """Wait for a button or link whose text contains text (case-insensitive)."""
+    return WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script(FIND_BY_TEXT_JS, text.lower())
+    )
+
+def dismiss_cookie_banner(driver, timeout=2):
+    """Click the cookie consent button if it appears within the timeout."""
+    try:
+        button = wait_for_element_by_text(driver, "accept", timeout)
+        driver.execute_script(CLICK_JS, button)
+        return True
+    except Exception:
+        return False
+
+def collect_hrefs(driver, css_selector):
+    """Return the href of every element matching a CSS selector in one script call."""
+    return driver.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0]), a => a.href)",
+        css_selector
+    )
+
+def get_workflow_links_static(max_workflows=10):
+    """Get workflow links from the server-rendered n8nArena.com page without a browser."""
+    if not SELECTOLAX_AVAILABLE:
+        return []
+    
+    log.info("🌐 Fetching n8nArena.com/workflows...")
+    try:
+        response = SESSION.get(ARENA_URL, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        log.warning(f"⚠️ Could not fetch arena page ({e}), falling back to browser")
+        return []
+    
+    tree = HTMLParser(response.content)
+    hrefs = (node.attributes.get('href') for node in tree.css(WORKFLOW_LINK_SELECTOR))
+    workflow_links = list(dict.fromkeys(h.split('?', 1)[0].rstrip('/') for h in hrefs if h))
+    log.info(f"📊 Found {len(workflow_links)} workflow links")
+    
+    return workflow_links[:max_workflows]
 
 def get_workflow_links_from_arena(driver, max_workflows=10):
     """Get workflow links from n8nArena.com sorted by newest."""
-    print("🌐 Opening n8nArena.com/workflows...")
-    driver.get("https://n8narena.com/workflows/")
-    time.sleep(3)
+    log.info("🌐 Opening n8nArena.com/workflows...")
+    driver.get(ARENA_URL)
     
-    # Handle cookie banner if present
+    # Wait for the workflow table to render its links
     try:
-        cookie_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Accept') or contains(text(), 'Accept All')]")
-        if cookie_buttons:
-            print("🍪 Accepting cookies...")
-            cookie_buttons[0].click()
-            time.sleep(2)
-    except:
-        pass
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, WORKFLOW_LINK_SELECTOR))
+        )
+    except TimeoutException:
+        log.warning("⚠️ Workflow links did not appear, continuing...")
+    
+    # Handle cookie banner if present
+    if dismiss_cookie_banner(driver):
+        log.info("🍪 Accepted cookies")
     
     # Look for sort options - try to sort by newest
-    print("📅 Looking for sort options...")
+    log.info("📅 Looking for sort options...")
     try:
         # Look for sort dropdown or buttons
         sort_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Newest') or contains(text(), 'Latest') or contains(text(), 'Date') or contains(text(), 'Creation')]")
         if sort_elements:
-            print("✅ Found sort option, clicking...")
+            log.info("✅ Found sort option, clicking...")
+            first_links = driver.find_elements(By.CSS_SELECTOR, WORKFLOW_LINK_SELECTOR)[:1]
             sort_elements[0].click()
-            time.sleep(2)
+            # The table re-renders after sorting; wait for the old rows to go away
+            if first_links:
+                try:
+                    WebDriverWait(driver, 5).until(EC.staleness_of(first_links[0]))
+                except TimeoutException:
+                    pass
     except:
-        print("⚠️ Could not find sort option, continuing...")
-    
-    # Get all workflow links from the table
-    print("🔗 Collecting workflow links from table...")
-    workflow_links = []
-    
-    # Look for links in the table - specifically in the Workflow Name column
-    links = driver.find_elements(By.TAG_NAME, "a")
-    print(f"🔍 Found {len(links)} total links on page")
-    
-    for link in links:
-        href = link.get_attribute("href")
-        if href:
-            print(f"  Link: {href}")
-            if "n8n.io/workflows/" in href:
-                workflow_links.append(href)
-    
-    print(f"📊 Found {len(workflow_links)} workflow links")
-    
-    # If no n8n.io links found, try looking for table rows
-    if not workflow_links:
-        print("🔍 Looking for table rows with workflow data...")
-        try:
-            # Look for table rows that might contain workflow links
-            rows = driver.find_elements(By.TAG_NAME, "tr")
-            for row in rows:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) >= 3:  # Workflow Name is typically the 3rd column
-                    workflow_cell = cells[2]  # Index 2 for Workflow Name column
-                    cell_links = workflow_cell.find_elements(By.TAG_NAME, "a")
-                    for cell_link in cell_links:
-                        href = cell_link.get_attribute("href")
-                        if href and "n8n.io/workflows/" in href:
-                            print(f"  Found workflow link in table: {href}")
-                            workflow_links.append(href)
-        except Exception as e:
-            print(f"  Error looking in table: {e}")
-    
-    print(f"📊 After table search: {len(workflow_links)} workflow links")
+        log.warning("⚠️ Could not find sort option, continuing...")
+    
+    # Collect all workflow links in a single round-trip to the browser
+    log.info("🔗 Collecting workflow links from table...")
+    hrefs = collect_hrefs(driver, WORKFLOW_LINK_SELECTOR)
+    
+    # Deduplicate (ignoring query strings and trailing slashes) while preserving page order
+    workflow_links = list(dict.fromkeys(h.split('?', 1)[0].rstrip('/') for h in hrefs))
+    log.info(f"📊 Found {len(workflow_links)} workflow links")
     
     # Limit to max_workflows
     if len(workflow_links) > max_workflows:
         workflow_links = workflow_links[:max_workflows]
-        print(f"📋 Limiting to {max_workflows} workflows")
+        log.info(f"📋 Limiting to {max_workflows} workflows")
     
     return workflow_links
 
+def write_workflow_json(filepath, data, pretty=False):
+    """Write workflow JSON compactly (or indented when pretty), using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2 if pretty else None)
+
+def scan_existing_workflows(dirpath):
+    """Return the stem of every .json file in dirpath using a single directory scan."""
+    try:
+        return {entry.name[:-5] for entry in os.scandir(dirpath)
+                if entry.name.endswith('.json') and entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
 def get_workflow_name_from_url(url):
     """Get workflow name from URL."""
     # Handle URLs like https://n8n.io/workflows/7328-generate-videos-from-text-prompts-using-gpt-5-and-google-veo-3
-    if "/workflows/" in url:
-        workflow_part = url.split("/workflows/")[-1].split("/")[0]
-        
-        # If it's a descriptive URL (contains dashes and text), extract the name
-        if "-" in workflow_part and not workflow_part.isdigit():
-            # Remove the ID at the start (e.g., "7328-")
-            name_part = workflow_part.split("-", 1)[1] if "-" in workflow_part else workflow_part
-            # Convert dashes to spaces and title case
-            name = name_part.replace('-', ' ').title()
-            return name
-        else:
-            # For numeric IDs, create a descriptive name
-            return f"Workflow_{workflow_part}"
-    return "Workflow"
+    match = WORKFLOW_ID_RE.search(url)
+    if not match:
+        return "Workflow"
+    # Descriptive slugs become title-cased names; bare numeric IDs get a placeholder
+    return (match.group(2) or f"Workflow_{match.group(1)}").replace('-', ' ').title()
 
-def scrape_single_workflow(driver, url):
-    """Scrape a single workflow from n8n.io."""
-    print(f"🔍 Scraping: {url}")
+def fetch_workflow_json(url):
+    """Fetch a workflow straight from the n8n template API.
+    
+    Returns (name, workflow_data), or None if the API cannot serve it.
+    """
+    match = WORKFLOW_ID_RE.search(url)
+    if not match:
+        return None
     
     try:
-        # Open the workflow page
-        driver.get(url)
-        time.sleep(3)
-        
-        # Handle cookie banner
-        try:
-            cookie_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Accept') or contains(text(), 'Accept All')]")
-            if cookie_buttons:
-                cookie_buttons[0].click()
-                time.sleep(2)
-        except:
-            pass
+        response = SESSION.get(TEMPLATE_API_URL.format(match.group(1)), timeout=10)
+        response.raise_for_status()
+        template = response.json()["workflow"]
+    except (requests.RequestException, ValueError, KeyError) as e:
+        log.warning(f"  ⚠️ Template API unavailable ({e}), falling back to browser")
+        return None
+    
+    if not isinstance(template, dict):
+        return None
+    
+    # Some responses wrap the nodes in a nested "workflow" object
+    nested = template.get("workflow")
+    workflow_data = nested if isinstance(nested, dict) else template
+    if "nodes" not in workflow_data:
+        return None
+    
+    return template.get("name"), workflow_data
+
+def extract_workflow_with_browser(driver, url):
+    """Open the workflow page and read the JSON embedded in <n8n-demo>.
+    
+    Returns (name, workflow_data), or None if the workflow could not be found.
+    """
+    # Open the workflow page
+    driver.get(url)
+    
+    # Wait until the "Use for Free" button is ready instead of sleeping
+    try:
+        use_button = wait_for_element_by_text(driver, "use for free", 15)
+    except TimeoutException:
+        log.error("  ❌ Could not find 'Use for Free' button")
+        return None
+    
+    # Handle cookie banner
+    dismiss_cookie_banner(driver)
+    
+    # Try to get the workflow name from the page header first
+    workflow_name = None
+    try:
+        # Look for h1 tags or main headers
+        headers = driver.find_elements(By.TAG_NAME, "h1")
+        if headers:
+            workflow_name = headers[0].text.strip()
+            log.info(f"  📝 Found name in header: {workflow_name}")
+    except:
+        pass
+    
+    # Click the button
+    driver.execute_script(CLICK_JS, use_button)
+    
+    # Wait for the embedded workflow to be rendered
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "n8n-demo[workflow]"))
+        )
+    except TimeoutException:
+        log.error("  ❌ Could not find workflow JSON")
+        return None
+    
+    # Read only the workflow attribute instead of shipping the whole page back
+    raw = driver.execute_script(
+        "const n = document.querySelector('n8n-demo'); return n ? n.getAttribute('workflow') : null"
+    )
+    
+    if raw is None:
+        # Fall back to scanning the rendered HTML
+        match = N8N_DEMO_RE.search(driver.page_source.encode())
+        if not match:
+            log.error("  ❌ Could not find workflow JSON")
+            return None
+        raw = match.group(1).decode()
+    
+    # Parse JSON (the attribute may still carry HTML entities)
+    json_str = html.unescape(raw)
+    workflow_data = orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
+    return workflow_name, workflow_data
+
+def scrape_single_workflow(get_driver, url, existing, pretty=False):
+    """Scrape a single workflow from n8n.io, skipping names already in existing.
+    
+    get_driver is called only if the browser fallback is needed.
+    """
+    log.info(f"🔍 Scraping: {url}")
+    
+    try:
+        # Try the template API first; only drive the browser if it fails
+        result = fetch_workflow_json(url)
+        if result:
+            log.info("  ⚡ Fetched workflow from template API")
+        else:
+            driver = get_driver()
+            if not driver:
+                return None
+            result = extract_workflow_with_browser(driver, url)
+            if not result:
+                return None
         
-        # Try to get the workflow name from the page header first
-        workflow_name = None
-        try:
-            # Look for h1 tags or main headers
-            headers = driver.find_elements(By.TAG_NAME, "h1")
-            if headers:
-                workflow_name = headers[0].text.strip()
-                print(f"  📝 Found name in header: {workflow_name}")
-        except:
-            pass
+        workflow_name, workflow_data = result
         
-        # If no header found, use URL
+        # If no name was found, use URL
         if not workflow_name:
             workflow_name = get_workflow_name_from_url(url)
-            print(f"  📝 Using name from URL: {workflow_name}")
-        
-        # Look for "Use for Free" button
-        buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Use for free')]")
-        
-        if not buttons:
-            print("  ❌ Could not find 'Use for Free' button")
-            return None
-        
-        # Click the button
-        driver.execute_script("arguments[0].scrollIntoView();", buttons[0])
-        time.sleep(1)
-        buttons[0].click()
-        time.sleep(3)
-        
-        # Get the workflow JSON
-        page_source = driver.page_source
-        pattern = r'<n8n-demo[^>]*workflow="([^"]*)"[^>]*>'
-        matches = re.findall(pattern, page_source)
+            log.info(f"  📝 Using name from URL: {workflow_name}")
         
-        if not matches:
-            print("  ❌ Could not find workflow JSON")
-            return None
-        
-        # Parse JSON
-        json_str = html.unescape(matches[0])
-        workflow_data = json.loads(json_str)
-        
-        print(f"  ✅ Found workflow: {len(workflow_data.get('nodes', []))} nodes")
+        log.info(f"  ✅ Found workflow: {len(workflow_data.get('nodes', []))} nodes")
         
         # Save with proper name
-        filename = f"{workflow_name.replace(' ', '_').replace('/', '_').replace(':', '_')}.json"
-        
-        workflows_dir = Path('workflows')
-        workflows_dir.mkdir(exist_ok=True)
-        
-        filepath = workflows_dir / filename
+        safe_name = workflow_name.translate(FILENAME_TRANS)
+        filename = f"{safe_name}.json"
         
         # Check if already exists
-        if filepath.exists():
-            print(f"  ⚠️ Already exists: {filename}")
+        if safe_name in existing:
+            log.warning(f"  ⚠️ Already exists: {filename}")
             return None
         
-        with open(filepath, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
+        write_workflow_json(WORKFLOWS_DIR / filename, workflow_data, pretty)
         
-        print(f"  💾 Saved as: {filename}")
+        existing.add(safe_name)
+        log.info(f"  💾 Saved as: {filename}")
         return filename
         
     except Exception as e:
-        print(f"  ❌ Error: {e}")
+        log.error(f"  ❌ Error: {e}")
         return None
 
 def main():
     """Main function."""
-    print("🚀 n8nArena Workflow Scraper")
-    print("=" * 40)
+    import argparse
     
-    driver = setup_driver()
-    if not driver:
-        return
+    parser = argparse.ArgumentParser(description='Scrape the newest workflows listed on n8nArena')
+    parser.add_argument('--pretty', action='store_true', help='Indent saved workflow JSON')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show debug output')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only show warnings and errors')
+    args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
+    
+    log.info("🚀 n8nArena Workflow Scraper")
+    log.info("=" * 40)
+    
+    # The browser is only started if something actually needs it
+    driver = None
+    
+    def get_driver():
+        nonlocal driver
+        if driver is None:
+            driver = setup_driver()
+        return driver
     
     try:
-        # Step 1-3: Get workflow links from n8nArena
-        workflow_links = get_workflow_links_from_arena(driver, max_workflows=5)
+        # Step 1-3: Get workflow links from n8nArena, rendering the page only if needed
+        workflow_links = get_workflow_links_static(max_workflows=5)
+        if not workflow_links and get_driver():
+            workflow_links = get_workflow_links_from_arena(driver, max_workflows=5)
         
         if not workflow_links:
-            print("❌ No workflow links found")
+            log.error("❌ No workflow links found")
             return
         
-        print(f"\n📋 Found {len(workflow_links)} workflows to scrape:")
+        log.info(f"\n📋 Found {len(workflow_links)} workflows to scrape:")
         for i, link in enumerate(workflow_links, 1):
-            print(f"  {i}. {link}")
+            log.debug(f"  {i}. {link}")
         
         # Step 4-6: Scrape each workflow
-        print(f"\n🔄 Starting to scrape {len(workflow_links)} workflows...")
+        log.info(f"\n🔄 Starting to scrape {len(workflow_links)} workflows...")
         scraped_count = 0
         
+        WORKFLOWS_DIR.mkdir(exist_ok=True)
+        existing = scan_existing_workflows(WORKFLOWS_DIR)
+        
         for i, link in enumerate(workflow_links, 1):
-            print(f"\n--- Workflow {i}/{len(workflow_links)} ---")
-            result = scrape_single_workflow(driver, link)
+            log.info(f"\n--- Workflow {i}/{len(workflow_links)} ---")
+            result = scrape_single_workflow(get_driver, link, existing, args.pretty)
             
             if result:
                 scraped_count += 1
@@ -243,13 +422,14 @@ def main():
             # Random delay between scrapes (human-like)
             if i < len(workflow_links):
                 delay = random.uniform(3, 8)
-                print(f"⏳ Waiting {delay:.1f} seconds...")
+                log.info(f"⏳ Waiting {delay:.1f} seconds...")
                 time.sleep(delay)
         
-        print(f"\n🎉 Completed! Scraped {scraped_count}/{len(workflow_links)} workflows")
+        log.info(f"\n🎉 Completed! Scraped {scraped_count}/{len(workflow_links)} workflows")
         
     finally:
-        driver.quit()
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     main()
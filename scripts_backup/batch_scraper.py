@@ -5,26 +5,35 @@ Batch n8n Workflow Scraper - Scrapes multiple workflows with enhanced metadata.
 
 import time
 import json
-import re
-import os
-import requests
-import zipfile
-import html
-import hashlib
-from datetime import datetime
+import logging
+import sys
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 
-# Import functions from the main scraper
-from scrape_workflows import (
-    download_chrome_driver, setup_driver, extract_workflow_json_from_page,
-    extract_metadata_from_workflow, sanitize_filename, get_existing_workflows
-)
+log = logging.getLogger("scraper")
+
+# Resolved once; created by scrape_workflow_batch() before any workflow is written
+WORKFLOWS_DIR = Path('workflows').resolve()
+
+# Finds the first clickable element whose text contains arguments[0] in one script call
+FIND_BY_TEXT_JS = """
+const t = arguments[0];
+for (const el of document.querySelectorAll('button, a, [role=button]')) {
+    if ((el.textContent || '').toLowerCase().includes(t)) return el;
+}
+return null;
+"""
+
+# Selenium and the shared scraper helpers are imported inside the functions
+# that use them, so `--help` and argument errors don't pay for loading them.
+
+def configure_logging(verbose=False, quiet=False):
+    """Send scraper log messages to stdout at the requested verbosity."""
+    logging.basicConfig(format="%(message)s", level=logging.WARNING, stream=sys.stdout)
+    log.setLevel(logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO)
 
 def get_workflow_urls_from_n8n_arena():
     """Get workflow URLs from n8nArena.com (simulated for now)."""
@@ -39,149 +48,177 @@ def get_workflow_urls_from_n8n_arena():
         "https://n8n.io/workflows/3456-payment-processing-automation/"
     ]
     
-    print(f"📋 Found {len(workflow_urls)} workflow URLs to process")
+    log.info(f"📋 Found {len(workflow_urls)} workflow URLs to process")
     return workflow_urls
 
-def scrape_workflow_batch(workflow_urls, max_workflows=None, delay=5):
-    """Scrape a batch of workflows."""
-    print("🚀 Starting Batch n8n Workflow Scraper")
-    print("=" * 60)
+def scrape_workflow_url(driver, workflow_url, existing_workflows, existing_lock):
+    """Scrape one workflow page with the given driver and save it if new.
+    
+    Returns "scraped", "duplicate" or "failed".
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    from scrape_workflows import (
+        extract_workflow_json_from_page, extract_metadata_from_workflow, sanitize_filename
+    )
+    
+    # Navigate to the workflow page
+    driver.get(workflow_url)
+    
+    # Wait for the "Use for free" button, looked up by text in a single script call
+    try:
+        button = WebDriverWait(driver, 15).until(
+            lambda d: d.execute_script(FIND_BY_TEXT_JS, "use for free")
+        )
+    except TimeoutException:
+        log.error("  ❌ Could not find 'Use for Free' button")
+        return "failed"
+    
+    log.info(f"  ✅ Found 'Use for free' button")
+    
+    # Scroll to and click the button
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", button)
+    log.info("  ✅ Clicked 'Use for Free' button!")
+    
+    # Wait for the modal to render the workflow JSON
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "n8n-demo[workflow]"))
+        )
+    except TimeoutException:
+        log.error("  ❌ Workflow JSON did not load")
+        return "failed"
+    
+    # Extract the workflow JSON
+    workflow_data = extract_workflow_json_from_page(driver)
+    
+    if not workflow_data:
+        log.error("  ❌ Could not extract workflow JSON")
+        return "failed"
+    
+    # Extract metadata
+    metadata = extract_metadata_from_workflow(workflow_data, workflow_url)
+    
+    # Create enhanced workflow with metadata
+    enhanced_workflow = {
+        "_metadata": metadata,
+        **workflow_data  # Original workflow data unchanged
+    }
+    
+    # Generate filename
+    workflow_name = metadata['workflow_name']
+    safe_name = sanitize_filename(workflow_name)
+    filename = f"{safe_name}.json"
+    
+    # Check for duplicates and claim the name so other workers skip it
+    with existing_lock:
+        if safe_name in existing_workflows:
+            log.warning(f"  ⚠️  Workflow already exists: {filename}")
+            return "duplicate"
+        existing_workflows.add(safe_name)
+    
+    # Save workflow
+    filepath = WORKFLOWS_DIR / filename
+    with open(filepath, 'w') as f:
+        json.dump(enhanced_workflow, f, indent=2)
+    
+    log.info(f"  💾 Saved workflow to {filename}")
+    
+    # Show workflow details
+    log.info(f"  📊 Details: {metadata['node_count']} nodes, {metadata['connection_count']} connections")
+    log.info(f"  🏷️  Categories: {', '.join(metadata['categories'])}")
+    log.info(f"  🔗 Integrations: {', '.join(metadata['integrations'])}")
+    log.info(f"  ⭐ Quality Score: {metadata['quality_score']}/100")
+    
+    return "scraped"
+
+def scrape_workflow_batch(workflow_urls, max_workflows=None, delay=5, workers=1):
+    """Scrape a batch of workflows using a pool of browser workers."""
+    # Import functions from the main scraper
+    from scrape_workflows import setup_driver, get_existing_workflows
+    
+    log.info("🚀 Starting Batch n8n Workflow Scraper")
+    log.info("=" * 60)
+    
+    WORKFLOWS_DIR.mkdir(exist_ok=True)
     
     # Get existing workflows for deduplication
     existing_workflows = get_existing_workflows()
-    print(f"📊 Found {len(existing_workflows)} existing workflows")
+    existing_lock = threading.Lock()
+    log.info(f"📊 Found {len(existing_workflows)} existing workflows")
+    
+    # Collapse duplicates and tracking-query variants of the same URL
+    unique_urls = list(dict.fromkeys(u.split('?', 1)[0].rstrip('/') for u in workflow_urls))
+    if len(unique_urls) != len(workflow_urls):
+        log.info(f"🧹 Deduplicated {len(workflow_urls)} URLs down to {len(unique_urls)}")
+    workflow_urls = unique_urls
     
     # Limit the number of workflows to scrape
     if max_workflows:
         workflow_urls = workflow_urls[:max_workflows]
-        print(f"📋 Limiting to {max_workflows} workflows")
+        log.info(f"📋 Limiting to {max_workflows} workflows")
     
-    driver = None
-    scraped_count = 0
-    failed_count = 0
+    workers = max(1, min(workers, len(workflow_urls)))
+    driver_pool = queue.Queue()
+    total = len(workflow_urls)
     
-    try:
-        driver = setup_driver()
-        
-        for i, workflow_url in enumerate(workflow_urls, 1):
-            print(f"\n🔍 [{i}/{len(workflow_urls)}] Scraping: {workflow_url}")
-            
+    def scrape_with_pooled_driver(job):
+        i, workflow_url = job
+        driver = driver_pool.get()
+        try:
+            log.info(f"\n🔍 [{i}/{total}] Scraping: {workflow_url}")
             try:
-                # Navigate to the workflow page
-                driver.get(workflow_url)
-                
-                # Wait for page to load
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                
-                # Wait for dynamic content
-                time.sleep(3)
-                
-                # Look for "Use for free" button
-                button_selectors = [
-                    "//*[contains(text(), 'Use for free')]",
-                    "//button[contains(text(), 'Use for free')]",
-                    "//a[contains(text(), 'Use for free')]"
-                ]
-                
-                button_found = False
-                for selector in button_selectors:
-                    try:
-                        buttons = driver.find_elements(By.XPATH, selector)
-                        if buttons:
-                            print(f"  ✅ Found 'Use for free' button")
-                            
-                            # Scroll to button
-                            driver.execute_script("arguments[0].scrollIntoView();", buttons[0])
-                            time.sleep(2)
-                            
-                            # Click the button
-                            buttons[0].click()
-                            print("  ✅ Clicked 'Use for Free' button!")
-                            button_found = True
-                            break
-                    except Exception as e:
-                        continue
-                
-                if not button_found:
-                    print("  ❌ Could not find 'Use for Free' button")
-                    failed_count += 1
-                    continue
-                
-                # Wait for the modal to appear and workflow JSON to load
-                time.sleep(5)
-                
-                # Extract the workflow JSON
-                workflow_data = extract_workflow_json_from_page(driver)
-                
-                if workflow_data:
-                    # Extract metadata
-                    metadata = extract_metadata_from_workflow(workflow_data, workflow_url)
-                    
-                    # Create enhanced workflow with metadata
-                    enhanced_workflow = {
-                        "_metadata": metadata,
-                        **workflow_data  # Original workflow data unchanged
-                    }
-                    
-                    # Generate filename
-                    workflow_name = metadata['workflow_name']
-                    safe_name = sanitize_filename(workflow_name)
-                    filename = f"{safe_name}.json"
-                    
-                    # Check for duplicates
-                    if safe_name in existing_workflows:
-                        print(f"  ⚠️  Workflow already exists: {filename}")
-                        continue
-                    
-                    # Save workflow
-                    filepath = Path('workflows') / filename
-                    with open(filepath, 'w') as f:
-                        json.dump(enhanced_workflow, f, indent=2)
-                    
-                    print(f"  💾 Saved workflow to {filename}")
-                    
-                    # Show workflow details
-                    print(f"  📊 Details: {metadata['node_count']} nodes, {metadata['connection_count']} connections")
-                    print(f"  🏷️  Categories: {', '.join(metadata['categories'])}")
-                    print(f"  🔗 Integrations: {', '.join(metadata['integrations'])}")
-                    print(f"  ⭐ Quality Score: {metadata['quality_score']}/100")
-                    
-                    scraped_count += 1
-                    existing_workflows.add(safe_name)  # Update for next iteration
-                    
-                else:
-                    print("  ❌ Could not extract workflow JSON")
-                    failed_count += 1
-                
-                # Delay between scrapes
-                if i < len(workflow_urls):
-                    print(f"  ⏱️  Waiting {delay} seconds before next scrape...")
-                    time.sleep(delay)
-                    
+                result = scrape_workflow_url(driver, workflow_url, existing_workflows, existing_lock)
             except Exception as e:
-                print(f"  ❌ Error scraping workflow: {e}")
-                failed_count += 1
-                continue
+                log.error(f"  ❌ Error scraping workflow: {e}")
+                result = "failed"
+            
+            # Per-worker jittered delay keeps the overall request rate polite
+            if i <= total - workers:
+                pause = random.uniform(delay * 0.5, delay * 1.5)
+                log.info(f"  ⏱️  Waiting {pause:.1f} seconds before next scrape...")
+                time.sleep(pause)
+            return result
+        finally:
+            driver_pool.put(driver)
+    
+    results = []
+    
+    try:
+        log.info(f"🧵 Starting {workers} browser worker(s)...")
+        for _ in range(workers):
+            driver_pool.put(setup_driver())
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(scrape_with_pooled_driver, enumerate(workflow_urls, 1)))
     
     except Exception as e:
-        print(f"❌ Error setting up driver: {e}")
+        log.error(f"❌ Error setting up driver: {e}")
     finally:
-        if driver:
-            driver.quit()
+        while not driver_pool.empty():
+            driver = driver_pool.get_nowait()
+            if driver:
+                driver.quit()
     
-    print("\n" + "=" * 60)
-    print("📊 Batch Scraping Summary:")
-    print(f"  ✅ Successfully scraped: {scraped_count}")
-    print(f"  ❌ Failed: {failed_count}")
-    print(f"  📋 Total processed: {len(workflow_urls)}")
+    scraped_count = results.count("scraped")
+    failed_count = results.count("failed")
+    
+    log.info("\n" + "=" * 60)
+    log.info("📊 Batch Scraping Summary:")
+    log.info(f"  ✅ Successfully scraped: {scraped_count}")
+    if failed_count:
+        log.warning(f"  ❌ Failed: {failed_count}")
+    else:
+        log.info(f"  ❌ Failed: {failed_count}")
+    log.info(f"  📋 Total processed: {len(workflow_urls)}")
     
     if scraped_count > 0:
-        print(f"\n🎉 SUCCESS: Added {scraped_count} new workflows!")
-        print("The workflow JSONs are unaltered with metadata added!")
+        log.info(f"\n🎉 SUCCESS: Added {scraped_count} new workflows!")
+        log.info("The workflow JSONs are unaltered with metadata added!")
     else:
-        print("\n⚠️  No new workflows were scraped.")
+        log.warning("\n⚠️  No new workflows were scraped.")
     
     return scraped_count
 
@@ -193,8 +230,12 @@ def main():
     parser.add_argument('--max', type=int, default=5, help='Maximum workflows to scrape')
     parser.add_argument('--delay', type=int, default=5, help='Delay between scrapes (seconds)')
     parser.add_argument('--urls', nargs='+', help='Specific workflow URLs to scrape')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parallel browser workers')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show debug output')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only show warnings and errors')
     
     args = parser.parse_args()
+    configure_logging(args.verbose, args.quiet)
     
     if args.urls:
         workflow_urls = args.urls
@@ -204,17 +245,18 @@ def main():
     scraped_count = scrape_workflow_batch(
         workflow_urls, 
         max_workflows=args.max, 
-        delay=args.delay
+        delay=args.delay,
+        workers=args.workers
     )
     
     if scraped_count > 0:
-        print(f"\n🔄 Generating indexes for {scraped_count} new workflows...")
+        log.info(f"\n🔄 Generating indexes for {scraped_count} new workflows...")
         try:
             from generate_indexes import main as generate_indexes
             generate_indexes()
-            print("✅ Indexes generated successfully!")
+            log.info("✅ Indexes generated successfully!")
         except Exception as e:
-            print(f"❌ Error generating indexes: {e}")
+            log.error(f"❌ Error generating indexes: {e}")
 
 if __name__ == "__main__":
     main()
@@ -4,16 +4,44 @@ CSV-based n8n Workflow Scraper
 Reads from final_consolidated.csv and scrapes workflows with proper names and popularity data
 """
 
-import csv
+import asyncio
 import time
 import json
 import re
 import html
 import random
 from pathlib import Path
+import numpy as np
+import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# Prefer orjson for reading and writing JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# aiohttp lets server-rendered workflow pages be fetched without a browser
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Compiled once; used for every scraped page and filename
+N8N_DEMO_RE = re.compile(r'<n8n-demo[^>]*workflow="([^"]*)"')
+FILENAME_UNSAFE_RE = re.compile(r'[^\w\s-]')
+FILENAME_SEPARATOR_RE = re.compile(r'[-\s]+')
+
+# Usage thresholds and the popularity score awarded from each one upwards
+POPULARITY_THRESHOLDS = np.array([100, 1000, 5000, 10000, 50000])
+POPULARITY_SCORES = np.array([25, 40, 55, 70, 85, 100])
 
 def extract_workflow_content(driver):
     """Extract description and instructions from workflow page."""
@@ -65,6 +93,9 @@ def setup_driver():
     options = Options()
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from driver.get() at DOMContentLoaded; explicit waits cover the rest
+    options.page_load_strategy = "eager"
     
     try:
         driver = webdriver.Chrome(options=options)
@@ -76,11 +107,11 @@ def setup_driver():
 def sanitize_filename(name):
     """Sanitize workflow name for filename."""
     # Remove special characters and replace spaces with underscores
-    sanitized = re.sub(r'[^\w\s-]', '', name)
-    sanitized = re.sub(r'[-\s]+', '_', sanitized)
+    sanitized = FILENAME_UNSAFE_RE.sub('', name)
+    sanitized = FILENAME_SEPARATOR_RE.sub('_', sanitized)
     return sanitized.strip('_')
 
-def scrape_workflow_from_url(driver, url, workflow_name, used_count):
+def scrape_workflow_from_url(driver, url, workflow_name, used_count, popularity_score=None):
     """Scrape a single workflow from n8n.io."""
     print(f"🔍 Scraping: {workflow_name}")
     print(f"   📊 Used by: {used_count} people")
@@ -88,116 +119,146 @@ def scrape_workflow_from_url(driver, url, workflow_name, used_count):
     try:
         # Open the workflow page
         driver.get(url)
-        time.sleep(3)
+        
+        # Wait for the "Use for Free" button rather than sleeping
+        try:
+            button = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'Use for free')]"))
+            )
+        except TimeoutException:
+            print("  ❌ Could not find 'Use for Free' button")
+            return None
         
         # Handle cookie banner
         try:
-            cookie_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Accept') or contains(text(), 'Accept All')]")
-            if cookie_buttons:
-                cookie_buttons[0].click()
-                time.sleep(2)
-        except:
+            WebDriverWait(driver, 2).until(
+                EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'Accept') or contains(text(), 'Accept All')]"))
+            ).click()
+        except Exception:
             pass
         
-        # Look for "Use for Free" button
-        buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Use for free')]")
+        # Click the button
+        driver.execute_script("arguments[0].scrollIntoView();", button)
+        button.click()
         
-        if not buttons:
-            print("  ❌ Could not find 'Use for Free' button")
+        # Wait for the workflow JSON to be rendered
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "n8n-demo[workflow]"))
+            )
+        except TimeoutException:
+            print("  ❌ Could not find workflow JSON")
             return None
         
-        # Click the button
-        driver.execute_script("arguments[0].scrollIntoView();", buttons[0])
-        time.sleep(1)
-        buttons[0].click()
-        time.sleep(3)
-        
         # Get the workflow JSON
-        page_source = driver.page_source
-        pattern = r'<n8n-demo[^>]*workflow="([^"]*)"[^>]*>'
-        matches = re.findall(pattern, page_source)
+        match = N8N_DEMO_RE.search(driver.page_source)
         
-        if not matches:
+        if not match:
             print("  ❌ Could not find workflow JSON")
             return None
         
-        # Parse JSON
-        json_str = html.unescape(matches[0])
-        workflow_data = json.loads(json_str)
+        workflow_data = parse_embedded_workflow(match.group(1))
         
         print(f"  ✅ Found workflow: {len(workflow_data.get('nodes', []))} nodes")
         
         # Extract workflow content
         content_data = extract_workflow_content(driver)
         
-        # Add metadata
-        if '_metadata' not in workflow_data:
-            workflow_data['_metadata'] = {}
-        
-        workflow_data['_metadata'].update({
-            'name': workflow_name,
-            'used_count': int(used_count),
-            'popularity_score': calculate_popularity_score(int(used_count)),
-            'source_url': url,
-            'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
-        })
-        
-        # Save with proper name
-        filename = f"{sanitize_filename(workflow_name)}.json"
-        
-        workflows_dir = Path('workflows')
-        workflows_dir.mkdir(exist_ok=True)
-        
-        filepath = workflows_dir / filename
-        
-        # Check if already exists
-        if filepath.exists():
-            print(f"  ⚠️ Already exists: {filename}")
-            return None
-        
-        with open(filepath, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
-        
-        print(f"  💾 Saved as: {filename}")
-        return filename
+        return save_workflow(workflow_data, url, workflow_name, used_count, popularity_score)
         
     except Exception as e:
         print(f"  ❌ Error: {e}")
         return None
 
+def parse_embedded_workflow(raw):
+    """Parse the HTML-escaped JSON from an <n8n-demo workflow="..."> attribute."""
+    json_str = html.unescape(raw)
+    return orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
+
+def save_workflow(workflow_data, url, workflow_name, used_count, popularity_score=None):
+    """Add popularity metadata and save the workflow; returns the filename or None if it exists."""
+    # Add metadata
+    if '_metadata' not in workflow_data:
+        workflow_data['_metadata'] = {}
+    
+    workflow_data['_metadata'].update({
+        'name': workflow_name,
+        'used_count': int(used_count),
+        'popularity_score': popularity_score if popularity_score is not None else calculate_popularity_score(int(used_count)),
+        'source_url': url,
+        'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
+    })
+    
+    # Save with proper name
+    filename = f"{sanitize_filename(workflow_name)}.json"
+    
+    workflows_dir = Path('workflows')
+    workflows_dir.mkdir(exist_ok=True)
+    
+    filepath = workflows_dir / filename
+    
+    # Check if already exists
+    if filepath.exists():
+        print(f"  ⚠️ Already exists: {filename}")
+        return None
+    
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(workflow_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(workflow_data, f, indent=2)
+    
+    print(f"  💾 Saved as: {filename}")
+    return filename
+
+async def fetch_embedded_workflow(session, semaphore, url):
+    """Fetch a workflow page and return its raw <n8n-demo> workflow attribute, if server-rendered."""
+    async with semaphore:
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status != 200:
+                    return None
+                page = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+    
+    match = N8N_DEMO_RE.search(page)
+    return match.group(1) if match else None
+
+async def fetch_embedded_workflows(urls, concurrency=16):
+    """Fetch many workflow pages concurrently over one HTTP session."""
+    semaphore = asyncio.BoundedSemaphore(concurrency)
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; n8n-workflow-library/1.0)"}
+    async with aiohttp.ClientSession(headers=headers) as session:
+        return await asyncio.gather(*(fetch_embedded_workflow(session, semaphore, url) for url in urls))
+
+def popularity_scores(used_counts):
+    """Calculate popularity scores for an array of usage counts in one vectorized lookup."""
+    return POPULARITY_SCORES[np.searchsorted(POPULARITY_THRESHOLDS, used_counts, side='right')]
+
 def calculate_popularity_score(used_count):
     """Calculate popularity score based on usage count."""
-    if used_count >= 50000:
-        return 100
-    elif used_count >= 10000:
-        return 85
-    elif used_count >= 5000:
-        return 70
-    elif used_count >= 1000:
-        return 55
-    elif used_count >= 100:
-        return 40
-    else:
-        return 25
+    return int(popularity_scores(used_count))
 
 def load_csv_data(csv_path):
-    """Load workflow data from CSV."""
-    workflows = []
-    
+    """Load workflow data from CSV, most used first."""
     try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                workflows.append({
-                    'name': row['Name'].strip(),
-                    'url': row['URL'].strip(),
-                    'used_count': int(row['Used'])
-                })
+        df = pd.read_csv(
+            csv_path,
+            usecols=['Name', 'URL', 'Used'],
+            dtype={'Name': str, 'URL': str, 'Used': 'int64'},
+            encoding='utf-8'
+        )
     except Exception as e:
         print(f"❌ Error reading CSV: {e}")
         return []
     
-    return workflows
+    df['Name'] = df['Name'].str.strip()
+    df['URL'] = df['URL'].str.strip()
+    df = df.sort_values('Used', ascending=False, kind='stable')
+    df['popularity_score'] = popularity_scores(df['Used'].to_numpy())
+    
+    return df.rename(columns={'Name': 'name', 'URL': 'url', 'Used': 'used_count'}).to_dict('records')
 
 def main():
     """Main function."""
@@ -218,9 +279,6 @@ def main():
         print("❌ No workflows found in CSV")
         return
     
-    # Sort by popularity (used count)
-    workflows.sort(key=lambda x: x['used_count'], reverse=True)
-    
     # Show top workflows
     print(f"\n🏆 Top 10 most popular workflows:")
     for i, workflow in enumerate(workflows[:10], 1):
@@ -234,29 +292,56 @@ def main():
         max_workflows = 5
         print(f"📋 Using default: {max_workflows} workflows")
     
-    # Setup driver
-    driver = setup_driver()
-    if not driver:
-        return
+    selected = workflows[:max_workflows]
+    
+    # Fetch every page concurrently first; only pages without server-rendered JSON need a browser
+    if AIOHTTP_AVAILABLE:
+        print(f"\n⚡ Fetching {len(selected)} workflow pages concurrently...")
+        prefetched = asyncio.run(fetch_embedded_workflows([w['url'] for w in selected]))
+        print(f"   ✅ {sum(1 for raw in prefetched if raw)} found without a browser")
+    else:
+        prefetched = [None] * len(selected)
+    
+    driver = None
     
     try:
         # Scrape workflows
         print(f"\n🔄 Starting to scrape {max_workflows} workflows...")
         scraped_count = 0
         
-        for i, workflow in enumerate(workflows[:max_workflows], 1):
+        for i, (workflow, raw) in enumerate(zip(selected, prefetched), 1):
             print(f"\n--- Workflow {i}/{max_workflows} ---")
+            
+            if raw:
+                print(f"🔍 Saving: {workflow['name']}")
+                try:
+                    workflow_data = parse_embedded_workflow(raw)
+                except ValueError as e:
+                    print(f"  ⚠️ Could not parse prefetched JSON ({e}), using browser")
+                    raw = None
+                else:
+                    if save_workflow(workflow_data, workflow['url'], workflow['name'], workflow['used_count'], workflow['popularity_score']):
+                        scraped_count += 1
+                    continue
+            
+            # Setup driver on first use
+            if driver is None:
+                driver = setup_driver()
+                if not driver:
+                    return
+            
             result = scrape_workflow_from_url(
                 driver, 
                 workflow['url'], 
                 workflow['name'], 
-                workflow['used_count']
+                workflow['used_count'],
+                workflow['popularity_score']
             )
             
             if result:
                 scraped_count += 1
             
-            # Random delay between scrapes (human-like)
+            # Random delay between browser scrapes (human-like)
             if i < max_workflows:
                 delay = random.uniform(3, 8)
                 print(f"⏳ Waiting {delay:.1f} seconds...")
@@ -271,7 +356,8 @@ def main():
             print("   3. Commit and push to GitHub")
         
     finally:
-        driver.quit()
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     main()
@@ -4,28 +4,98 @@ Simple Human-like n8n Scraper
 Just opens the page, clicks "Use for Free", and gets the JSON.
 """
 
-import time
 import json
 import re
+import os
 import html
+import requests
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from requests.adapters import HTTPAdapter
+
+# Selenium is imported inside the browser functions, so runs served by the
+# plain HTTP fetch never pay for loading it.
+
+# Prefer orjson for encoding/decoding workflow JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Compiled once; matches the workflow JSON embedded in the n8n-demo component
+N8N_DEMO_RE = re.compile(rb'<n8n-demo[^>]*workflow="([^"]*)"', re.S)
+LEADING_NUMBER_RE = re.compile(r'^\d+\s*')
+
+# Resolved once; created by main() before any workflow is written
+WORKFLOWS_DIR = Path('workflows').resolve()
+USE_FOR_FREE_XPATH = "//*[contains(text(), 'Use for free')]"
+N8N_DEMO_ATTR_JS = "document.querySelector('n8n-demo')?.getAttribute('workflow')"
+COOKIE_ACCEPT_SELECTOR = "button[aria-label*='Accept' i], button[id*='accept' i], #onetrust-accept-btn-handler"
+
+# Images, fonts, media and analytics the scraper never reads
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.woff2", "*.woff", "*.ttf", "*.mp4", "*.webm",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*"
+]
+
+# Shared HTTP session so repeated fetches reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+SESSION.headers["User-Agent"] = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 def setup_simple_driver():
     """Simple Chrome setup - like a human would use."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
     options = Options()
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2
+    })
+    # Return from driver.get() at DOMContentLoaded; explicit waits cover the rest
+    options.page_load_strategy = "eager"
+    
+    # SCRAPER_HEADLESS=1 skips drawing a window; leave it unset to watch the browser
+    if os.environ.get("SCRAPER_HEADLESS") == "1":
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,900")
+        options.add_argument("--disable-software-rasterizer")
     
     # Use existing Chrome driver if available
     try:
         driver = webdriver.Chrome(options=options)
-        return driver
     except:
         print("❌ Chrome not found. Please install Chrome browser.")
         return None
+    
+    # Skip heavy resources at the network layer
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ Could not enable resource blocking: {e}")
+    
+    return driver
+
+def parse_workflow_json(json_str):
+    """Parse workflow JSON, using orjson when installed."""
+    return orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
+
+def write_workflow_json(filepath, data):
+    """Write indented workflow JSON in a single call, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        filepath.write_text(json.dumps(data, indent=2))
 
 def get_workflow_name_from_url(url):
     """Get workflow name from URL - simple approach."""
@@ -36,82 +106,101 @@ def get_workflow_name_from_url(url):
         # Convert to readable name
         name = last_part.replace('-', ' ').title()
         # Remove numbers at start
-        name = re.sub(r'^\d+\s*', '', name)
+        name = LEADING_NUMBER_RE.sub('', name)
         return name
     return "Workflow"
 
-def scrape_workflow(url):
-    """Simple workflow scraping - like a human would do."""
-    print(f"🔍 Scraping: {url}")
+def try_http_fetch(url):
+    """Fetch the page over plain HTTP and read the embedded workflow JSON, or return None."""
+    try:
+        response = SESSION.get(url, timeout=15)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"  ⚠️ HTTP fetch failed: {e}")
+        return None
+    
+    # Search the raw body; only the matched attribute gets decoded
+    match = N8N_DEMO_RE.search(response.content)
+    if not match:
+        return None
+    
+    try:
+        return parse_workflow_json(html.unescape(match.group(1).decode()))
+    except json.JSONDecodeError:
+        return None
+
+def read_workflow_attribute(driver, element):
+    """Read the n8n-demo workflow attribute with one CDP Runtime.evaluate round-trip."""
+    try:
+        result = driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": N8N_DEMO_ATTR_JS,
+            "returnByValue": True
+        })
+        return result.get("result", {}).get("value")
+    except Exception:
+        # Not a Chromium driver; ask WebDriver for the attribute instead
+        return element.get_attribute("workflow")
+
+def scrape_workflow_with_browser(url):
+    """Open the page in Chrome, click "Use for Free", and read the workflow JSON."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
     
     driver = setup_simple_driver()
     if not driver:
         return None
     
     try:
-        # 1. Open the page (like a human)
+        # 1. Open the page and wait for the "Use for Free" button instead of sleeping
         print("  📄 Opening page...")
         driver.get(url)
-        time.sleep(3)  # Wait like a human
+        wait = WebDriverWait(driver, 15, poll_frequency=0.2)
+        try:
+            wait.until(EC.presence_of_element_located((By.XPATH, USE_FOR_FREE_XPATH)))
+        except TimeoutException:
+            print("  ❌ Could not find 'Use for Free' button")
+            return None
         
         # 2. Handle cookie banner (like a human would)
         print("  🍪 Checking for cookie banner...")
         try:
-            cookie_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Accept') or contains(text(), 'Accept All') or contains(text(), 'OK')]")
-            if cookie_buttons:
-                print("  ✅ Found cookie banner, accepting...")
-                cookie_buttons[0].click()
-                time.sleep(2)
-        except:
+            cookie_button = WebDriverWait(driver, 1, poll_frequency=0.1).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, COOKIE_ACCEPT_SELECTOR))
+            )
+            print("  ✅ Found cookie banner, accepting...")
+            cookie_button.click()
+        except TimeoutException:
             pass  # No cookie banner
         
-        # 3. Look for "Use for Free" button
-        print("  🔍 Looking for 'Use for Free' button...")
-        buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Use for free')]")
+        # 3. Scroll to the button and click once it is clickable
+        print("  ✅ Found button, scrolling and clicking...")
+        button = driver.find_element(By.XPATH, USE_FOR_FREE_XPATH)
+        driver.execute_script("arguments[0].scrollIntoView();", button)
+        wait.until(EC.element_to_be_clickable(button)).click()
         
-        if not buttons:
-            print("  ❌ Could not find 'Use for Free' button")
+        # 4. Wait for the modal's n8n-demo component
+        try:
+            demo = wait.until(EC.presence_of_element_located((By.TAG_NAME, "n8n-demo")))
+        except TimeoutException:
+            print("  ❌ Workflow preview did not load")
             return None
         
-        # 4. Scroll to button and click (like a human)
-        print("  ✅ Found button, scrolling and clicking...")
-        driver.execute_script("arguments[0].scrollIntoView();", buttons[0])
-        time.sleep(1)
-        buttons[0].click()
-        time.sleep(3)  # Wait for modal
-        
-        # 5. Get the page source and find JSON
+        # 5. Read the workflow attribute from the DOM (already entity-decoded)
         print("  📋 Getting workflow JSON...")
-        page_source = driver.page_source
+        json_str = read_workflow_attribute(driver, demo)
+        if json_str:
+            return parse_workflow_json(json_str)
         
-        # Look for the workflow JSON in the n8n-demo component
-        pattern = r'<n8n-demo[^>]*workflow="([^"]*)"[^>]*>'
-        matches = re.findall(pattern, page_source)
+        # 6. Fall back to scanning the page source
+        match = N8N_DEMO_RE.search(driver.page_source.encode())
         
-        if not matches:
+        if not match:
             print("  ❌ Could not find workflow JSON")
             return None
         
-        # 6. Extract and parse JSON
-        json_str = html.unescape(matches[0])
-        workflow_data = json.loads(json_str)
-        
-        print(f"  ✅ Found workflow: {len(workflow_data.get('nodes', []))} nodes")
-        
-        # 7. Get workflow name
-        workflow_name = get_workflow_name_from_url(url)
-        filename = f"{workflow_name.replace(' ', '_')}.json"
-        
-        # 8. Save the workflow
-        workflows_dir = Path('workflows')
-        workflows_dir.mkdir(exist_ok=True)
-        
-        filepath = workflows_dir / filename
-        with open(filepath, 'w') as f:
-            json.dump(workflow_data, f, indent=2)
-        
-        print(f"  💾 Saved as: {filename}")
-        return filename
+        return parse_workflow_json(html.unescape(match.group(1).decode()))
         
     except Exception as e:
         print(f"  ❌ Error: {e}")
@@ -119,6 +208,30 @@ def scrape_workflow(url):
     finally:
         driver.quit()
 
+def scrape_workflow(url):
+    """Simple workflow scraping - plain HTTP first, Chrome only if that misses."""
+    print(f"🔍 Scraping: {url}")
+    
+    # Most pages ship the workflow JSON in their initial HTML
+    workflow_data = try_http_fetch(url)
+    if workflow_data is None:
+        print("  🌐 Workflow not in page HTML, opening browser...")
+        workflow_data = scrape_workflow_with_browser(url)
+    if workflow_data is None:
+        return None
+    
+    print(f"  ✅ Found workflow: {len(workflow_data.get('nodes', []))} nodes")
+    
+    # 7. Get workflow name
+    workflow_name = get_workflow_name_from_url(url)
+    filename = f"{workflow_name.replace(' ', '_')}.json"
+    
+    # 8. Save the workflow
+    write_workflow_json(WORKFLOWS_DIR / filename, workflow_data)
+    
+    print(f"  💾 Saved as: {filename}")
+    return filename
+
 def main():
     """Main function."""
     print("🚀 Simple n8n Workflow Scraper")
@@ -127,6 +240,7 @@ def main():
     # Test with the workflow we know works
     url = "https://n8n.io/workflows/5678-automate-email-filtering-and-ai-summarization-100percent-free-and-effective-works-724/"
     
+    WORKFLOWS_DIR.mkdir(exist_ok=True)
     result = scrape_workflow(url)
     
     if result:
@@ -9,56 +9,98 @@ import json
 import random
 import os
 import requests
-import zipfile
-import html
+from requests.adapters import HTTPAdapter
 import re
+from functools import lru_cache
+from multiprocessing import Pool
+from multiprocessing.util import Finalize
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from lxml import html as lxml_html
 
-def download_chrome_driver():
-    """Download the correct Chrome driver for Mac ARM64."""
-    print("📥 Downloading Chrome driver for Mac ARM64...")
-    
-    # Create driver directory
-    driver_dir = os.path.expanduser("~/chromedriver")
-    os.makedirs(driver_dir, exist_ok=True)
-    
-    # Download URL for Mac ARM64 Chrome driver
-    driver_url = "https://edgedl.me.gvt1.com/edgedl/chrome/chrome-for-testing/139.0.7258.68/mac-arm64/chromedriver-mac-arm64.zip"
-    
-    try:
-        # Download the driver
-        response = requests.get(driver_url, stream=True)
-        response.raise_for_status()
-        
-        zip_path = os.path.join(driver_dir, "chromedriver.zip")
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        # Extract the zip file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(driver_dir)
-        
-        # Make the driver executable
-        driver_path = os.path.join(driver_dir, "chromedriver-mac-arm64", "chromedriver")
-        os.chmod(driver_path, 0o755)
-        
-        print(f"✅ Chrome driver downloaded to: {driver_path}")
-        return driver_path
-        
-    except Exception as e:
-        print(f"❌ Failed to download Chrome driver: {e}")
-        return None
+# Selenium is imported inside the functions that drive the browser, so the
+# interactive prompt and `--help` don't pay for loading it.
+
+# Prefer orjson for encoding/decoding workflow JSON
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# One Aho-Corasick pass finds every metadata keyword when pyahocorasick is installed
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Cache template API responses on disk so repeat runs skip the network
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Cached templates are fetched again after a day
+TEMPLATE_CACHE_EXPIRE_SECONDS = 24 * 60 * 60
+
+# Created on first use in each process: importing stays free of side effects, and
+# pool workers never share the parent's SQLite connection across a fork
+SESSION = None
+SESSION_PID = None
+
+# Images, fonts and media the scraper never reads; Chrome drops these requests unsent
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg", "*.ico",
+    "*.woff2", "*.woff", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3"
+]
+
+# Cheap CSS lookups for the "Use for free" button, tried before any text search
+USE_FOR_FREE_SELECTORS = [
+    "[data-test-id='use-for-free-button']",
+    "a[href*='use-free']"
+]
+USE_FOR_FREE_XPATH = "//*[contains(text(), 'Use for free')]"
+# Tries each selector in arguments[0] in order, then the first button or link
+# whose text contains arguments[1], all in one script call
+FIND_BUTTON_JS = """
+for (const sel of arguments[0]) {
+    const el = document.querySelector(sel);
+    if (el) return el;
+}
+const t = arguments[1];
+for (const el of document.querySelectorAll('button, a, [role=button]')) {
+    if ((el.textContent || '').toLowerCase().includes(t)) return el;
+}
+return null;
+"""
+N8N_DEMO_ATTRS_JS = "Array.from(document.querySelectorAll('n8n-demo'), e => e.getAttribute('workflow'))"
+
+TEMPLATE_API_URL = "https://api.n8n.io/api/workflows/templates/{}"
+WORKFLOW_ID_RE = re.compile(r"/workflows/(\d+)")
+
+# Resolved once; created by main() before any workflow is written
+WORKFLOWS_DIR = Path('workflows').resolve()
+
+# Compiled once; used on every scraped page, URL and workflow
+LEADING_NUMBER_RE = re.compile(r'^\d+\s*')
+MARKDOWN_HEADER_RE = re.compile(r'^#+\s*')
+DEFAULT_NODE_NAME_RE = re.compile(r'^(Node|HTTP Request|Set|If)\d*$')
+# Hardcoded API keys, passwords and bearer tokens, found in a single scan
+HARDCODED_SECRET_RE = re.compile(
+    rb'api[_-]?key["\s:]+["\'][A-Za-z0-9]{20,}'
+    rb'|password["\s:]+["\'][^"\']+["\']'
+    rb'|Bearer [A-Za-z0-9]{20,}',
+    re.IGNORECASE
+)
 
 def setup_driver():
-    """Initialize Chrome WebDriver for Mac ARM64."""
+    """Initialize Chrome WebDriver; Selenium Manager resolves a matching chromedriver."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
     chrome_options = Options()
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
@@ -66,6 +108,13 @@ def setup_driver():
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
     
+    # SCRAPER_HEADLESS=1 skips drawing a window; leave it unset to watch the browser
+    headless = os.environ.get("SCRAPER_HEADLESS") == "1"
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1280,900")
+        chrome_options.add_argument("--disable-software-rasterizer")
+    
     # User agent to appear more like a real browser
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
@@ -75,51 +124,98 @@ def setup_driver():
         chrome_options.binary_location = chrome_path
         print(f"✅ Using Chrome at: {chrome_path}")
     
-    # Download and use the correct driver
-    driver_path = download_chrome_driver()
-    if not driver_path:
-        raise Exception("Could not download Chrome driver")
-    
     try:
-        service = Service(driver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = webdriver.Chrome(options=chrome_options)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        driver.set_window_size(1920, 1080)
+        # Headless runs keep the smaller viewport set by --window-size
+        if not headless:
+            driver.set_window_size(1920, 1080)
+        
+        # Skip heavy resources at the network layer
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"⚠️  Could not enable resource blocking: {e}")
         
         return driver
     except Exception as e:
         print(f"❌ Error setting up Chrome driver: {e}")
         raise
 
+def find_use_for_free_button(driver):
+    """Return the 'Use for free' button if it is on the page, or None."""
+    # One round trip per poll; the text search only checks buttons and links,
+    # so it avoids walking every text node
+    return driver.execute_script(FIND_BUTTON_JS, USE_FOR_FREE_SELECTORS, "use for free")
+
+def serialize_workflow(workflow_data):
+    """Serialize a workflow to compact JSON bytes for keyword checks, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(workflow_data)
+    return json.dumps(workflow_data).encode()
+
+def parse_workflow_json(json_str):
+    """Parse workflow JSON, using orjson when installed."""
+    return orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
+
+def write_workflow_json(filepath, data):
+    """Atomically write indented workflow JSON, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    
+    # Write beside the target and rename so a crash never leaves a partial file
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, filepath)
+
+def parse_complete_workflow(json_str):
+    """Parse workflow JSON, returning it only if it has nodes and connections."""
+    try:
+        workflow_data = parse_workflow_json(json_str)
+    except json.JSONDecodeError as e:
+        print(f"❌ Error parsing JSON: {e}")
+        return None
+    
+    # Check if it's a complete workflow
+    if isinstance(workflow_data, dict) and 'nodes' in workflow_data and 'connections' in workflow_data:
+        print(f"✅ Found complete workflow JSON: {len(workflow_data['nodes'])} nodes, {len(workflow_data['connections'])} connections")
+        return workflow_data
+    return None
+
+def read_workflow_attributes(driver):
+    """Return the workflow attribute of every n8n-demo element in one CDP round-trip."""
+    from selenium.webdriver.common.by import By
+    
+    try:
+        result = driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": N8N_DEMO_ATTRS_JS,
+            "returnByValue": True
+        })
+        return result.get("result", {}).get("value") or []
+    except Exception:
+        # Not a Chromium driver; fall back to one WebDriver call per element
+        return [element.get_attribute("workflow") for element in driver.find_elements(By.TAG_NAME, "n8n-demo")]
+
 def extract_workflow_json_from_page(driver):
     """Extract complete workflow JSON from the page after clicking 'Use for Free'."""
     try:
-        # Get the page source
-        page_source = driver.page_source
+        # Read the attributes from the DOM; Chrome has already decoded the HTML entities
+        for json_str in read_workflow_attributes(driver):
+            if json_str:
+                workflow_data = parse_complete_workflow(json_str)
+                if workflow_data:
+                    return workflow_data
         
-        # Look for the n8n-demo component with workflow JSON
-        n8n_demo_pattern = r'<n8n-demo[^>]*workflow="([^"]*)"[^>]*>'
-        matches = re.findall(n8n_demo_pattern, page_source)
-        
-        if matches:
-            print(f"Found {len(matches)} n8n-demo components")
-            
-            for i, match in enumerate(matches):
-                # The workflow JSON is HTML-encoded, so we need to decode it
-                decoded_json = html.unescape(match)
-                
-                try:
-                    # Parse the JSON
-                    workflow_data = json.loads(decoded_json)
-                    
-                    # Check if it's a complete workflow
-                    if isinstance(workflow_data, dict) and 'nodes' in workflow_data and 'connections' in workflow_data:
-                        print(f"✅ Found complete workflow JSON: {len(workflow_data['nodes'])} nodes, {len(workflow_data['connections'])} connections")
-                        return workflow_data
-                        
-                except json.JSONDecodeError as e:
-                    print(f"❌ Error parsing JSON: {e}")
-                    continue
+        # Fall back to parsing the serialized page source; lxml unescapes attribute values
+        tree = lxml_html.fromstring(driver.page_source)
+        for json_str in tree.xpath('//n8n-demo/@workflow'):
+            # xpath yields str subclasses, which orjson rejects
+            workflow_data = parse_complete_workflow(str(json_str))
+            if workflow_data:
+                return workflow_data
         
         print("❌ No complete workflow JSON found in page")
         return None
@@ -130,6 +226,8 @@ def extract_workflow_json_from_page(driver):
 
 def extract_workflow_name_from_page(driver):
     """Extract the actual workflow name from the page."""
+    from selenium.webdriver.common.by import By
+    
     try:
         # Try to find the workflow name in the page title or headings
         page_title = driver.title
@@ -160,18 +258,9 @@ def extract_workflow_name_from_page(driver):
             pass
         
         # Try to extract from URL path
-        current_url = driver.current_url
-        if "workflows/" in current_url:
-            # Extract the last part of the URL path
-            url_parts = current_url.split("/")
-            if len(url_parts) > 2:
-                last_part = url_parts[-2] if url_parts[-1] == "" else url_parts[-1]
-                # Convert URL format to readable name
-                name = last_part.replace("-", " ").replace("_", " ").title()
-                # Remove numbers at the beginning
-                name = re.sub(r'^\d+\s*', '', name)
-                if name and len(name) > 3:
-                    return name
+        name = get_workflow_name_from_url(driver.current_url)
+        if name:
+            return name
         
         return "Untitled Workflow"
         
@@ -179,103 +268,198 @@ def extract_workflow_name_from_page(driver):
         print(f"  ⚠️  Error extracting workflow name: {e}")
         return "Untitled Workflow"
 
-def extract_metadata_from_workflow(workflow_data, source_url, driver=None):
+def get_workflow_name_from_url(url):
+    """Derive a readable workflow name from a workflow URL slug, or return None."""
+    if "workflows/" not in url:
+        return None
+    
+    # Extract the last part of the URL path
+    url_parts = url.split("/")
+    if len(url_parts) > 2:
+        last_part = url_parts[-2] if url_parts[-1] == "" else url_parts[-1]
+        # Convert URL format to readable name
+        name = last_part.replace("-", " ").replace("_", " ").title()
+        # Remove numbers at the beginning
+        name = LEADING_NUMBER_RE.sub('', name)
+        if name and len(name) > 3:
+            return name
+    
+    return None
+
+def extract_metadata_from_workflow(workflow_data, source_url, driver=None, workflow_name=None):
     """Extract metadata from workflow without altering core data."""
     # Extract the actual workflow name from the page
     if driver:
         workflow_name = extract_workflow_name_from_page(driver)
-    else:
+    elif not workflow_name:
         workflow_name = workflow_data.get('name', 'Untitled Workflow')
     
+    # Serialize once and find every keyword in a single pass over the bytes
+    workflow_blob = serialize_workflow(workflow_data)
+    buckets = match_keyword_buckets(workflow_blob.lower())
+    
+    # Walk the nodes once for every node-level check
+    summary = scan_nodes(workflow_data.get('nodes', []))
+    connection_count = len(workflow_data.get('connections', {}))
+    
     metadata = {
         "workflow_name": workflow_name,
         "scraped_at": datetime.now().isoformat(),
         "source_url": source_url,
-        "node_count": len(workflow_data.get('nodes', [])),
-        "connection_count": len(workflow_data.get('connections', {})),
-        "has_trigger": any('trigger' in node.get('type', '').lower() for node in workflow_data.get('nodes', [])),
-        "has_credentials": any('credentials' in node for node in workflow_data.get('nodes', [])),
-        "integrations": extract_integrations(workflow_data),
-        "categories": detect_categories(workflow_data),
-        "complexity": calculate_complexity(workflow_data),
-        "quality_score": calculate_quality_score(workflow_data),
-        "description": extract_description(workflow_data)
+        "node_count": summary.node_count,
+        "connection_count": connection_count,
+        "has_trigger": summary.has_trigger,
+        "has_credentials": summary.has_credentials,
+        "integrations": list(summary.integrations),
+        "categories": detect_categories(buckets),
+        "complexity": calculate_complexity(summary, connection_count),
+        "quality_score": calculate_quality_score(summary, workflow_blob, buckets),
+        "description": extract_description(summary)
     }
     
     return metadata
 
-def extract_integrations(workflow_data):
-    """Extract integration services from workflow."""
-    integrations = set()
+# Node type substrings (lowercased) that identify each integration service
+SERVICE_MAPPING = {
+    'gmail': ['gmail', 'gmailtrigger'],
+    'google-sheets': ['googlesheets'],
+    'slack': ['slack'],
+    'discord': ['discord'],
+    'telegram': ['telegram'],
+    'stripe': ['stripe'],
+    'openai': ['openai', 'gpt'],
+    'anthropic': ['anthropic', 'claude'],
+    'groq': ['groq'],
+    'http': ['httprequest', 'webhook'],
+    'mysql': ['mysql'],
+    'postgres': ['postgres'],
+    'notion': ['notion'],
+    'airtable': ['airtable'],
+    'hubspot': ['hubspot'],
+    'salesforce': ['salesforce'],
+    'zapier': ['zapier'],
+    'twilio': ['twilio'],
+    'sendgrid': ['sendgrid'],
+    'mailchimp': ['mailchimp']
+}
+
+@dataclass
+class NodeSummary:
+    """Per-workflow node aggregates, filled in by a single pass over the nodes."""
+    node_count: int = 0
+    has_trigger: bool = False
+    has_credentials: bool = False
+    has_conditionals: bool = False
+    has_loops: bool = False
+    has_documentation: bool = False
+    default_name_count: int = 0
+    integrations: set = field(default_factory=set)
+    description_parts: list = field(default_factory=list)
+
+def scan_nodes(nodes):
+    """Collect every node-level fact the metadata needs in one pass."""
+    summary = NodeSummary(node_count=len(nodes))
     
-    for node in workflow_data.get('nodes', []):
+    for node in nodes:
         node_type = node.get('type', '')
+        type_lower = node_type.lower()
+        
+        summary.has_trigger = summary.has_trigger or 'trigger' in type_lower
+        summary.has_credentials = summary.has_credentials or 'credentials' in node
+        summary.has_conditionals = summary.has_conditionals or 'if' in type_lower
+        summary.has_loops = summary.has_loops or 'loop' in type_lower
+        
+        if DEFAULT_NODE_NAME_RE.match(node.get('name', '')):
+            summary.default_name_count += 1
         
         # Map node types to service names
-        service_mapping = {
-            'gmail': ['gmail', 'gmailTrigger'],
-            'google-sheets': ['googleSheets'],
-            'slack': ['slack'],
-            'discord': ['discord'],
-            'telegram': ['telegram'],
-            'stripe': ['stripe'],
-            'openai': ['openai', 'gpt'],
-            'anthropic': ['anthropic', 'claude'],
-            'groq': ['groq'],
-            'http': ['httpRequest', 'webhook'],
-            'mysql': ['mysql'],
-            'postgres': ['postgres'],
-            'notion': ['notion'],
-            'airtable': ['airtable'],
-            'hubspot': ['hubspot'],
-            'salesforce': ['salesforce'],
-            'zapier': ['zapier'],
-            'twilio': ['twilio'],
-            'sendgrid': ['sendgrid'],
-            'mailchimp': ['mailchimp']
-        }
+        for service, patterns in SERVICE_MAPPING.items():
+            if any(pattern in type_lower for pattern in patterns):
+                summary.integrations.add(service)
         
-        for service, patterns in service_mapping.items():
-            if any(pattern.lower() in node_type.lower() for pattern in patterns):
-                integrations.add(service)
-    
-    return list(integrations)
-
-def detect_categories(workflow_data):
-    """Detect workflow categories based on content."""
-    categories = set()
-    workflow_text = json.dumps(workflow_data).lower()
-    
-    category_patterns = {
-        'ai-automation': ['gpt', 'claude', 'openai', 'anthropic', 'llm', 'langchain', 'ai', 'groq'],
-        'email-automation': ['gmail', 'email', 'mailchimp', 'sendgrid'],
-        'data-processing': ['csv', 'excel', 'transform', 'database', 'mysql', 'postgres'],
-        'communication': ['slack', 'discord', 'telegram', 'twilio', 'sms'],
-        'payment-processing': ['stripe', 'paypal', 'payment', 'invoice'],
-        'file-management': ['gdrive', 'dropbox', 's3', 'upload', 'download'],
-        'web-scraping': ['scrape', 'crawl', 'extract', 'parse'],
-        'api-integration': ['http', 'webhook', 'rest', 'api'],
-        'scheduling': ['cron', 'schedule', 'trigger'],
-        'notifications': ['notify', 'alert', 'notification']
-    }
-    
-    for category, patterns in category_patterns.items():
-        if any(pattern in workflow_text for pattern in patterns):
-            categories.add(category)
+        if node_type == 'n8n-nodes-base.stickyNote':
+            content = node.get('parameters', {}).get('content', '')
+            if len(content) > 100:  # Substantial documentation
+                summary.has_documentation = True
+            
+            # Extract title or first paragraph as a description
+            for line in content.split('\n')[:3]:  # First 3 lines
+                line = MARKDOWN_HEADER_RE.sub('', line).strip()  # Remove markdown headers
+                if line and len(line) > 20:
+                    summary.description_parts.append(line)
+                    break
     
-    return list(categories) if categories else ['general']
+    return summary
+
+# Keywords looked for in the lowercased serialized workflow
+CATEGORY_PATTERNS = {
+    'ai-automation': [b'gpt', b'claude', b'openai', b'anthropic', b'llm', b'langchain', b'ai', b'groq'],
+    'email-automation': [b'gmail', b'email', b'mailchimp', b'sendgrid'],
+    'data-processing': [b'csv', b'excel', b'transform', b'database', b'mysql', b'postgres'],
+    'communication': [b'slack', b'discord', b'telegram', b'twilio', b'sms'],
+    'payment-processing': [b'stripe', b'paypal', b'payment', b'invoice'],
+    'file-management': [b'gdrive', b'dropbox', b's3', b'upload', b'download'],
+    'web-scraping': [b'scrape', b'crawl', b'extract', b'parse'],
+    'api-integration': [b'http', b'webhook', b'rest', b'api'],
+    'scheduling': [b'cron', b'schedule', b'trigger'],
+    'notifications': [b'notify', b'alert', b'notification']
+}
+ERROR_INDICATORS = [b'error', b'catch', b'try', b'fail', b'stopanderror']
+MODERN_SERVICES = [b'openai', b'anthropic', b'gpt', b'claude', b'langchain', b'stripe', b'twilio']
+
+def build_keyword_buckets():
+    """Map each keyword to every category or check it marks."""
+    buckets = {}
+    for category, patterns in CATEGORY_PATTERNS.items():
+        for pattern in patterns:
+            buckets.setdefault(pattern, set()).add(category)
+    for pattern in ERROR_INDICATORS:
+        buckets.setdefault(pattern, set()).add('error-handling')
+    for pattern in MODERN_SERVICES:
+        buckets.setdefault(pattern, set()).add('modern-integrations')
+    return {keyword: frozenset(tags) for keyword, tags in buckets.items()}
+
+KEYWORD_BUCKETS = build_keyword_buckets()
+# Once every tag has matched, the rest of the workflow can't add anything
+KEYWORD_TAG_COUNT = len(frozenset().union(*KEYWORD_BUCKETS.values()))
+
+def build_keyword_automaton():
+    """Compile every keyword into one Aho-Corasick automaton."""
+    automaton = ahocorasick.Automaton()
+    for keyword, tags in KEYWORD_BUCKETS.items():
+        automaton.add_word(keyword.decode(), tags)
+    automaton.make_automaton()
+    return automaton
 
-def calculate_complexity(workflow_data):
+KEYWORD_AUTOMATON = build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+
+def match_keyword_buckets(blob_lower):
+    """Return every category or check whose keywords occur in the lowercased workflow."""
+    found = set()
+    if KEYWORD_AUTOMATON is not None:
+        for _, tags in KEYWORD_AUTOMATON.iter(blob_lower.decode()):
+            found |= tags
+            if len(found) == KEYWORD_TAG_COUNT:
+                break
+    else:
+        for keyword, tags in KEYWORD_BUCKETS.items():
+            if keyword in blob_lower:
+                found |= tags
+                if len(found) == KEYWORD_TAG_COUNT:
+                    break
+    return found
+
+def detect_categories(buckets):
+    """Detect workflow categories from the matched keyword buckets."""
+    categories = [category for category in CATEGORY_PATTERNS if category in buckets]
+    return categories if categories else ['general']
+
+def calculate_complexity(summary, connection_count):
     """Calculate workflow complexity."""
-    node_count = len(workflow_data.get('nodes', []))
-    connection_count = len(workflow_data.get('connections', {}))
-    has_conditionals = any('if' in node.get('type', '').lower() for node in workflow_data.get('nodes', []))
-    has_loops = any('loop' in node.get('type', '').lower() for node in workflow_data.get('nodes', []))
-    
-    score = node_count + (connection_count * 0.5)
-    if has_conditionals:
+    score = summary.node_count + (connection_count * 0.5)
+    if summary.has_conditionals:
         score += 3
-    if has_loops:
+    if summary.has_loops:
         score += 5
     
     if score <= 5:
@@ -285,145 +469,125 @@ def calculate_complexity(workflow_data):
     else:
         return 'advanced'
 
-def calculate_quality_score(workflow_data):
+def calculate_quality_score(summary, workflow_blob, buckets):
     """Calculate workflow quality score (0-100)."""
     score = 0
     
     # Has documentation (30 points)
-    if has_documentation(workflow_data):
+    if summary.has_documentation:
         score += 30
     
     # Uses credentials properly (20 points)
-    if uses_proper_credentials(workflow_data):
+    if uses_proper_credentials(summary, workflow_blob):
         score += 20
     
     # Has error handling (15 points)
-    if has_error_handling(workflow_data):
+    if 'error-handling' in buckets:
         score += 15
     
     # Well organized (10 points)
-    if is_well_organized(workflow_data):
+    if is_well_organized(summary):
         score += 10
     
-    # Modern integrations (15 points)
-    if has_modern_integrations(workflow_data):
+    # Modern AI/API integrations (15 points)
+    if 'modern-integrations' in buckets:
         score += 15
     
     # Reusable/parameterized (10 points)
-    if is_parameterized(workflow_data):
+    if is_parameterized(workflow_blob):
         score += 10
     
     return min(score, 100)
 
-def has_documentation(workflow_data):
-    """Check if workflow has documentation."""
-    for node in workflow_data.get('nodes', []):
-        if node.get('type') == 'n8n-nodes-base.stickyNote':
-            content = node.get('parameters', {}).get('content', '')
-            if len(content) > 100:  # Substantial documentation
-                return True
-    return False
-
-def uses_proper_credentials(workflow_data):
+def uses_proper_credentials(summary, workflow_blob):
     """Check if credentials are used properly (not hardcoded)."""
-    workflow_str = json.dumps(workflow_data)
+    # Check if uses credential nodes; without any, there's no need to scan for secrets
+    if not summary.has_credentials:
+        return False
     
     # Check for hardcoded API keys or passwords
-    hardcoded_patterns = [
-        r'api[_-]?key["\s:]+["\'][A-Za-z0-9]{20,}',
-        r'password["\s:]+["\'][^"\']+["\']',
-        r'Bearer [A-Za-z0-9]{20,}'
-    ]
-    
-    for pattern in hardcoded_patterns:
-        if re.search(pattern, workflow_str, re.IGNORECASE):
-            return False
-    
-    # Check if uses credential nodes
-    return any('credentials' in node for node in workflow_data.get('nodes', []))
+    return not HARDCODED_SECRET_RE.search(workflow_blob)
 
-def has_error_handling(workflow_data):
-    """Check for error handling patterns."""
-    error_indicators = ['error', 'catch', 'try', 'fail', 'stopAndError']
-    workflow_str = json.dumps(workflow_data).lower()
-    
-    return any(indicator in workflow_str for indicator in error_indicators)
-
-def is_well_organized(workflow_data):
+def is_well_organized(summary):
     """Check if workflow is well organized."""
-    nodes = workflow_data.get('nodes', [])
-    if len(nodes) < 3:
+    if summary.node_count < 3:
         return True
     
     # Check if nodes have meaningful names
-    default_names = 0
-    for node in nodes:
-        name = node.get('name', '')
-        if re.match(r'^(Node|HTTP Request|Set|If)\d*$', name):
-            default_names += 1
-    
-    return default_names < len(nodes) / 2
-
-def has_modern_integrations(workflow_data):
-    """Check for modern AI/API integrations."""
-    modern_services = ['openai', 'anthropic', 'gpt', 'claude', 'langchain', 'stripe', 'twilio']
-    workflow_str = json.dumps(workflow_data).lower()
-    
-    return any(service in workflow_str for service in modern_services)
+    return summary.default_name_count < summary.node_count / 2
 
-def is_parameterized(workflow_data):
+def is_parameterized(workflow_blob):
     """Check if workflow uses parameters/variables."""
-    workflow_str = json.dumps(workflow_data)
-    
     # Check for expression usage
-    return '{{' in workflow_str or '$(' in workflow_str
+    return b'{{' in workflow_blob or b'$(' in workflow_blob
 
-def extract_description(workflow_data):
-    """Extract description from sticky notes or metadata."""
-    description_parts = []
-    
-    # Extract from sticky notes
-    for node in workflow_data.get('nodes', []):
-        if node.get('type') == 'n8n-nodes-base.stickyNote':
-            content = node.get('parameters', {}).get('content', '')
-            if content:
-                # Extract title or first paragraph
-                lines = content.split('\n')
-                for line in lines[:3]:  # First 3 lines
-                    line = re.sub(r'^#+\s*', '', line).strip()  # Remove markdown headers
-                    if line and len(line) > 20:
-                        description_parts.append(line)
-                        break
-    
-    return ' | '.join(description_parts[:2]) if description_parts else ''
+def extract_description(summary):
+    """Join the first two sticky-note descriptions found while scanning the nodes."""
+    return ' | '.join(summary.description_parts[:2]) if summary.description_parts else ''
+
+# Invalid filename characters and spaces all become underscores in one pass
+SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?* '})
 
 def sanitize_filename(name):
     """Sanitize workflow name for filename."""
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    
-    # Replace spaces with underscores
-    name = name.replace(' ', '_')
-    
-    # Limit length
-    if len(name) > 100:
-        name = name[:100]
-    
-    return name
+    # Replace invalid characters and spaces, then limit length
+    return name.translate(SANITIZE_TABLE)[:100]
 
+@lru_cache(maxsize=1)
 def get_existing_workflows():
-    """Get list of existing workflow filenames."""
-    workflows_dir = Path('workflows')
-    if not workflows_dir.exists():
+    """Get the existing workflow filenames (cached until the next save)."""
+    if not WORKFLOWS_DIR.exists():
+        return frozenset()
+    
+    # scandir reuses the directory listing's file type, so there's no stat or Path per file;
+    # frozen so callers can't mutate the cached result
+    with os.scandir(WORKFLOWS_DIR) as entries:
+        return frozenset(
+            entry.name[:-5]  # filename without extension
+            for entry in entries
+            if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)
+        )
+
+# Kept outside workflows/ so it is never mistaken for a workflow file
+SCRAPED_URLS_FILE = Path('indexes') / 'scraped_urls.json'
+
+def load_scraped_urls():
+    """Load the set of workflow URLs that have already been scraped."""
+    try:
+        with open(SCRAPED_URLS_FILE) as f:
+            return set(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
         return set()
-    
-    existing = set()
-    for file in workflows_dir.glob('*.json'):
-        existing.add(file.stem)  # filename without extension
-    
-    return existing
+
+SCRAPED_URLS = load_scraped_urls()
+
+def save_scraped_urls():
+    """Atomically persist the set of scraped URLs."""
+    SCRAPED_URLS_FILE.parent.mkdir(exist_ok=True)
+    # Write beside the target and rename so a crash never leaves a truncated file
+    tmp_path = SCRAPED_URLS_FILE.with_name(SCRAPED_URLS_FILE.name + '.tmp')
+    tmp_path.write_text(json.dumps(sorted(SCRAPED_URLS), indent=2))
+    os.replace(tmp_path, SCRAPED_URLS_FILE)
+
+def record_scraped_url(url, persist=True):
+    """Remember a scraped URL, persisting the set unless the caller saves it later."""
+    SCRAPED_URLS.add(url)
+    if persist:
+        save_scraped_urls()
+
+def get_session():
+    """Return this process's HTTP session, creating it on first use."""
+    global SESSION, SESSION_PID
+    if SESSION is None or SESSION_PID != os.getpid():
+        if REQUESTS_CACHE_AVAILABLE:
+            session = requests_cache.CachedSession(
+                'n8n_template_cache', backend='sqlite', expire_after=TEMPLATE_CACHE_EXPIRE_SECONDS
+            )
+        else:
+            session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        SESSION, SESSION_PID = session, os.getpid()
+    return SESSION
 
 def get_next_workflow_url():
     """Get the next workflow URL to scrape."""
@@ -446,8 +610,89 @@ def get_next_workflow_url():
     # You can add more URLs here or implement dynamic discovery
     return workflow_urls
 
-def scrape_single_workflow(workflow_url, min_delay=8, max_delay=15):
-    """Scrape a single workflow with random delay."""
+def update_indexes():
+    """Rebuild the workflow indexes from the workflows directory."""
+    print("  🔄 Updating indexes...")
+    try:
+        from generate_indexes import main as generate_indexes
+        generate_indexes()
+        print("  ✅ Indexes updated!")
+    except Exception as e:
+        print(f"  ❌ Error updating indexes: {e}")
+
+def fetch_workflow_via_api(workflow_url):
+    """Fetch a workflow straight from the n8n template API.
+    
+    Returns (name, workflow_data), or None if the API cannot serve it.
+    """
+    match = WORKFLOW_ID_RE.search(workflow_url)
+    if not match:
+        return None
+    
+    try:
+        response = get_session().get(TEMPLATE_API_URL.format(match.group(1)), timeout=10)
+        response.raise_for_status()
+        template = response.json()["workflow"]
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"  ⚠️  Template API unavailable ({e}), falling back to browser")
+        return None
+    
+    if not isinstance(template, dict):
+        return None
+    
+    # Some responses wrap the nodes in a nested "workflow" object
+    nested = template.get("workflow")
+    workflow_data = nested if isinstance(nested, dict) else template
+    if "nodes" not in workflow_data or "connections" not in workflow_data:
+        return None
+    
+    return template.get("name"), workflow_data
+
+def extract_workflow_with_browser(driver, workflow_url):
+    """Open the workflow page, click 'Use for free' and read the workflow JSON, or return None."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    
+    # Navigate to the workflow page
+    print("  📄 Loading workflow page...")
+    driver.get(workflow_url)
+    
+    # Wait for the "Use for free" button rather than a fixed delay
+    wait = WebDriverWait(driver, 15, poll_frequency=0.2)
+    try:
+        button = wait.until(find_use_for_free_button)
+    except TimeoutException:
+        # Last resort: one full-document XPath text search
+        buttons = driver.find_elements(By.XPATH, USE_FOR_FREE_XPATH)
+        button = buttons[0] if buttons else None
+    
+    if button is None:
+        print("  ❌ Could not find 'Use for Free' button")
+        return None
+    print(f"  ✅ Found 'Use for free' button")
+    
+    # Scroll to button and click once it is clickable
+    driver.execute_script("arguments[0].scrollIntoView();", button)
+    wait.until(EC.element_to_be_clickable(button)).click()
+    print("  ✅ Clicked 'Use for Free' button!")
+    
+    # Wait for the modal's n8n-demo component to carry the workflow JSON
+    try:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "n8n-demo[workflow]")))
+    except TimeoutException:
+        print("  ❌ Workflow preview did not load")
+        return None
+    
+    # Extract the workflow JSON
+    return extract_workflow_json_from_page(driver)
+
+def scrape_single_workflow(get_driver, workflow_url, regenerate_indexes=True, persist_urls=True):
+    """Scrape a single workflow, starting the browser via get_driver() only if the API misses.
+    
+    Pool workers pass persist_urls=False and leave saving scraped_urls.json to the parent.
+    """
     print(f"🔍 Scraping single workflow: {workflow_url}")
     print("=" * 60)
     
@@ -455,115 +700,178 @@ def scrape_single_workflow(workflow_url, min_delay=8, max_delay=15):
     existing_workflows = get_existing_workflows()
     print(f"📊 Found {len(existing_workflows)} existing workflows")
     
-    driver = None
+    # Skip known workflows before touching the browser
+    url_name = get_workflow_name_from_url(workflow_url)
+    if workflow_url in SCRAPED_URLS or (url_name and sanitize_filename(url_name) in existing_workflows):
+        print("  ⏭️  Workflow already scraped, skipping")
+        return False
+    
     try:
-        driver = setup_driver()
+        # The template API serves the same JSON without rendering the page
+        api_result = fetch_workflow_via_api(workflow_url)
+        if api_result:
+            print("  ✅ Fetched workflow from the template API")
+            api_name, workflow_data = api_result
+            metadata = extract_metadata_from_workflow(workflow_data, workflow_url, workflow_name=api_name)
+        else:
+            driver = get_driver()
+            workflow_data = extract_workflow_with_browser(driver, workflow_url)
+            if not workflow_data:
+                print("  ❌ Could not extract workflow JSON")
+                return False
+            metadata = extract_metadata_from_workflow(workflow_data, workflow_url, driver)
         
-        # Navigate to the workflow page
-        print("  📄 Loading workflow page...")
-        driver.get(workflow_url)
+        # Create enhanced workflow with metadata
+        enhanced_workflow = {
+            "_metadata": metadata,
+            **workflow_data  # Original workflow data unchanged
+        }
         
-        # Wait for page to load
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        # Generate filename
+        workflow_name = metadata['workflow_name']
+        safe_name = sanitize_filename(workflow_name)
+        filename = f"{safe_name}.json"
         
-        # Wait for dynamic content
-        time.sleep(3)
+        # Check for duplicates
+        if safe_name in existing_workflows:
+            print(f"  ⚠️  Workflow already exists: {filename}")
+            record_scraped_url(workflow_url, persist_urls)
+            return False
         
-        # Look for "Use for free" button
-        button_selectors = [
-            "//*[contains(text(), 'Use for free')]",
-            "//button[contains(text(), 'Use for free')]",
-            "//a[contains(text(), 'Use for free')]"
-        ]
+        # Save workflow
+        write_workflow_json(WORKFLOWS_DIR / filename, enhanced_workflow)
+        get_existing_workflows.cache_clear()
+        record_scraped_url(workflow_url, persist_urls)
         
-        button_found = False
-        for selector in button_selectors:
-            try:
-                buttons = driver.find_elements(By.XPATH, selector)
-                if buttons:
-                    print(f"  ✅ Found 'Use for free' button")
-                    
-                    # Scroll to button
-                    driver.execute_script("arguments[0].scrollIntoView();", buttons[0])
-                    time.sleep(2)
-                    
-                    # Click the button
-                    buttons[0].click()
-                    print("  ✅ Clicked 'Use for Free' button!")
-                    button_found = True
-                    break
-            except Exception as e:
-                continue
+        print(f"  💾 Saved workflow to {filename}")
         
-        if not button_found:
-            print("  ❌ Could not find 'Use for Free' button")
-            return False
+        # Show workflow details
+        print(f"  📊 Details: {metadata['node_count']} nodes, {metadata['connection_count']} connections")
+        print(f"  🏷️  Categories: {', '.join(metadata['categories'])}")
+        print(f"  🔗 Integrations: {', '.join(metadata['integrations'])}")
+        print(f"  ⭐ Quality Score: {metadata['quality_score']}/100")
         
-        # Wait for the modal to appear and workflow JSON to load
-        time.sleep(5)
+        # Generate indexes (batch callers rebuild once at the end instead)
+        if regenerate_indexes:
+            update_indexes()
         
-        # Extract the workflow JSON
-        workflow_data = extract_workflow_json_from_page(driver)
+        print(f"\n🎉 SUCCESS: Added workflow '{workflow_name}'!")
+        return True
         
-        if workflow_data:
-            # Extract metadata
-            metadata = extract_metadata_from_workflow(workflow_data, workflow_url, driver)
-            
-            # Create enhanced workflow with metadata
-            enhanced_workflow = {
-                "_metadata": metadata,
-                **workflow_data  # Original workflow data unchanged
-            }
-            
-            # Generate filename
-            workflow_name = metadata['workflow_name']
-            safe_name = sanitize_filename(workflow_name)
-            filename = f"{safe_name}.json"
-            
-            # Check for duplicates
-            if safe_name in existing_workflows:
-                print(f"  ⚠️  Workflow already exists: {filename}")
-                return False
-            
-            # Save workflow
-            filepath = Path('workflows') / filename
-            with open(filepath, 'w') as f:
-                json.dump(enhanced_workflow, f, indent=2)
-            
-            print(f"  💾 Saved workflow to {filename}")
-            
-            # Show workflow details
-            print(f"  📊 Details: {metadata['node_count']} nodes, {metadata['connection_count']} connections")
-            print(f"  🏷️  Categories: {', '.join(metadata['categories'])}")
-            print(f"  🔗 Integrations: {', '.join(metadata['integrations'])}")
-            print(f"  ⭐ Quality Score: {metadata['quality_score']}/100")
-            
-            # Generate indexes
-            print("  🔄 Updating indexes...")
-            try:
-                from generate_indexes import main as generate_indexes
-                generate_indexes()
-                print("  ✅ Indexes updated!")
-            except Exception as e:
-                print(f"  ❌ Error updating indexes: {e}")
-            
-            print(f"\n🎉 SUCCESS: Added workflow '{workflow_name}'!")
-            return True
-            
-        else:
-            print("  ❌ Could not extract workflow JSON")
-            return False
-            
     except Exception as e:
         print(f"  ❌ Error scraping workflow: {e}")
         return False
+
+def scrape_many(workflow_urls, min_delay=8, max_delay=15, regenerate_indexes=True):
+    """Scrape several workflows in one Chrome session with random delays between them.
+    
+    Indexes are rebuilt once after the batch, and only if something was saved.
+    """
+    # The browser is only started if the template API misses
+    driver = None
+    
+    def get_driver():
+        nonlocal driver
+        if driver is None:
+            driver = setup_driver()
+        return driver
+    
+    scraped = 0
+    try:
+        for i, url in enumerate(workflow_urls):
+            if i > 0:
+                delay = random.randint(min_delay, max_delay)
+                print(f"⏱️  Waiting {delay} seconds before the next workflow...")
+                time.sleep(delay)
+                # A fresh navigation is far cheaper than relaunching Chrome
+                if driver:
+                    driver.delete_all_cookies()
+            
+            if scrape_single_workflow(get_driver, url, regenerate_indexes=False):
+                scraped += 1
     finally:
         if driver:
             driver.quit()
     
-    return False
+    if scraped and regenerate_indexes:
+        update_indexes()
+    
+    return scraped
+
+# Per-process state for pool workers, set up by init_worker
+WORKER_DRIVER = None
+WORKER_SETTINGS = {}
+
+def init_worker(min_delay, max_delay):
+    """Pool initializer: remember the settings and quit this worker's Chrome on exit."""
+    WORKER_SETTINGS.update(min_delay=min_delay, max_delay=max_delay, jobs=0)
+    # atexit hooks don't run in pool workers; multiprocessing finalizers do
+    Finalize(None, quit_worker_driver, exitpriority=10)
+
+def get_worker_driver():
+    """Start this worker's Chrome the first time a URL misses the template API."""
+    global WORKER_DRIVER
+    if WORKER_DRIVER is None:
+        WORKER_DRIVER = setup_driver()
+    return WORKER_DRIVER
+
+def quit_worker_driver():
+    """Close this worker's Chrome if it was ever started."""
+    global WORKER_DRIVER
+    if WORKER_DRIVER is not None:
+        WORKER_DRIVER.quit()
+        WORKER_DRIVER = None
+
+def scrape_worker(workflow_url):
+    """Pool worker: scrape one URL, reusing this process's Chrome session.
+    
+    Returns (url, saved, recorded) so the parent can persist the URL itself.
+    """
+    min_delay = WORKER_SETTINGS['min_delay']
+    max_delay = WORKER_SETTINGS['max_delay']
+    
+    if WORKER_SETTINGS['jobs'] == 0:
+        # Stagger worker start-up so the workers don't hit n8n.io in lockstep
+        time.sleep(random.uniform(0, max_delay))
+    else:
+        time.sleep(random.randint(min_delay, max_delay))
+        if WORKER_DRIVER:
+            WORKER_DRIVER.delete_all_cookies()
+    WORKER_SETTINGS['jobs'] += 1
+    
+    saved = scrape_single_workflow(get_worker_driver, workflow_url, regenerate_indexes=False, persist_urls=False)
+    return workflow_url, saved, workflow_url in SCRAPED_URLS
+
+def scrape_parallel(workflow_urls, workers=4, min_delay=8, max_delay=15):
+    """Hand URLs to a pool of processes as they free up, each driving one Chrome instance."""
+    workers = max(1, min(workers, len(workflow_urls)))
+    if workers == 1:
+        return scrape_many(workflow_urls, min_delay, max_delay)
+    
+    pool = Pool(processes=workers, initializer=init_worker, initargs=(min_delay, max_delay))
+    scraped = 0
+    try:
+        # API hits finish in a second while browser scrapes take many, so
+        # pull URLs one at a time instead of pre-splitting them per worker
+        for url, saved, recorded in pool.imap_unordered(scrape_worker, workflow_urls):
+            scraped += saved
+            if recorded:
+                SCRAPED_URLS.add(url)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        # A clean close/join lets each worker run its finalizer and quit Chrome
+        pool.join()
+        # Workers only hold forked copies of SCRAPED_URLS, so the parent is the one writer
+        save_scraped_urls()
+    
+    # Workers skip the rebuild, so it runs once here for the whole batch
+    if scraped:
+        update_indexes()
+    
+    return scraped
 
 def main():
     """Main function for single workflow scraping."""
@@ -571,18 +879,26 @@ def main():
     
     parser = argparse.ArgumentParser(description='Scrape a single n8n workflow')
     parser.add_argument('--url', type=str, help='Specific workflow URL to scrape')
+    parser.add_argument('--all', action='store_true', help='Scrape every known workflow URL')
+    parser.add_argument('--workers', type=int, default=4, help='Number of parallel browser processes for --all')
     parser.add_argument('--min-delay', type=int, default=8, help='Minimum delay between scrapes (seconds)')
     parser.add_argument('--max-delay', type=int, default=15, help='Maximum delay between scrapes (seconds)')
     
     args = parser.parse_args()
+    WORKFLOWS_DIR.mkdir(exist_ok=True)
     
     if args.url:
         # Scrape specific URL
-        success = scrape_single_workflow(args.url, args.min_delay, args.max_delay)
+        success = scrape_many([args.url], args.min_delay, args.max_delay) == 1
         if success:
             print("\n✅ Workflow scraped successfully!")
         else:
             print("\n❌ Failed to scrape workflow.")
+    elif args.all:
+        # Scrape the whole list, one reused browser per worker process
+        workflow_urls = get_next_workflow_url()
+        scraped = scrape_parallel(workflow_urls, args.workers, args.min_delay, args.max_delay)
+        print(f"\n✅ Scraped {scraped}/{len(workflow_urls)} workflows")
     else:
         # Interactive mode
         print("🚀 Single Workflow Scraper")
@@ -614,7 +930,7 @@ def main():
                 print(f"⏱️  Waiting {delay} seconds before starting...")
                 time.sleep(delay)
                 
-                success = scrape_single_workflow(url, args.min_delay, args.max_delay)
+                success = scrape_many([url], args.min_delay, args.max_delay) == 1
                 
                 if success:
                     print("\n✅ Workflow scraped successfully!")
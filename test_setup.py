@@ -5,8 +5,30 @@ Test script to verify the n8n workflow library setup
 
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Prefer orjson for parsing workflow and index files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def read_json(file_path):
+    """Parse a JSON file, using orjson when installed."""
+    data = file_path.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def check_workflow_file(workflow_path):
+    """Parse one workflow file and return (name, ok, metadata or error message)."""
+    workflow_file = Path(workflow_path)
+    try:
+        data = read_json(workflow_file)
+        return workflow_file.name, True, data['_metadata'] if '_metadata' in data else None
+    except Exception as e:
+        return workflow_file.name, False, str(e)
+
 def test_structure():
     """Test the repository structure."""
     print("🔍 Testing Repository Structure...")
@@ -51,23 +73,24 @@ def test_workflows():
         print("  ❌ workflows/ directory not found")
         return False
     
-    workflow_files = list(workflows_dir.glob('*.json'))
+    # scandir skips the per-file stat and Path objects that glob creates
+    with os.scandir(workflows_dir) as entries:
+        workflow_files = [
+            entry.path for entry in entries
+            if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)
+        ]
     print(f"  📊 Found {len(workflow_files)} workflow files")
     
-    for workflow_file in workflow_files:
-        try:
-            with open(workflow_file, 'r') as f:
-                data = json.load(f)
-            
+    # Parsing is CPU-bound, so spread the files across cores; map keeps the output in order
+    with ProcessPoolExecutor() as executor:
+        for name, ok, result in executor.map(check_workflow_file, workflow_files, chunksize=32):
+            if not ok:
+                print(f"  ❌ {name} - Error: {result}")
             # Check if it has metadata (enhanced workflow)
-            if '_metadata' in data:
-                metadata = data['_metadata']
-                print(f"  ✅ {workflow_file.name} - Enhanced (Quality: {metadata.get('quality_score', 'N/A')})")
+            elif result is not None:
+                print(f"  ✅ {name} - Enhanced (Quality: {result.get('quality_score', 'N/A')})")
             else:
-                print(f"  ⚠️  {workflow_file.name} - Basic (no metadata)")
-                
-        except Exception as e:
-            print(f"  ❌ {workflow_file.name} - Error: {e}")
+                print(f"  ⚠️  {name} - Basic (no metadata)")
     
     return len(workflow_files) > 0
 
@@ -87,8 +110,7 @@ def test_indexes():
         file_path = indexes_dir / index_file
         if file_path.exists():
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                read_json(file_path)
                 print(f"  ✅ {index_file} - Valid JSON")
             except Exception as e:
                 print(f"  ❌ {index_file} - Invalid JSON: {e}")